@@ -1,6 +1,16 @@
 ### AI STUFF ###
+import asyncio
+import atexit
+import datetime
+import hashlib
+import io
+import mmap
 import os
 import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import google.generativeai as genai
 from google.cloud import texttospeech # Import WaveNet library
@@ -23,24 +33,145 @@ if google_app_credentials_path is None:
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = google_app_credentials_path
 print(f"Set GOOGLE_APPLICATION_CREDENTIALS to: {os.environ['GOOGLE_APPLICATION_CREDENTIALS']}")
 
-# --- Initialize Gemini API client ---
-genai.configure(api_key=gemini_api_key)
-model = genai.GenerativeModel('gemini-1.5-flash') # Recommended for quick text tasks
-
-# --- Initialize Google Cloud Text-to-Speech Client ---
-try:
-    tts_client = texttospeech.TextToSpeechClient()
-    print("Google Cloud Text-to-Speech client initialized.")
-except Exception as e:
-    # Adding a check here to ensure the file exists at the set path
-    if not os.path.exists(google_app_credentials_path):
-        raise RuntimeError(f"Failed to initialize Google Cloud Text-to-Speech client. "
-                           f"The JSON key file was NOT found at the specified path: {google_app_credentials_path}. "
-                           f"Error: {e}")
-    else:
-        raise RuntimeError(f"Failed to initialize Google Cloud Text-to-Speech client. "
-                           f"Ensure GOOGLE_APPLICATION_CREDENTIALS is set correctly and the JSON file exists: {e}")
+# The static rephrase instruction shared by every Gemini call
+REPHRASE_INSTRUCTION = ("Rephrase the following Star Wars Wookieepedia article content in an "
+                        "engaging, concise, and informative way, suitable for a narration. "
+                        "Focus on the core facts and avoid phrases like 'this article describes' "
+                        "or 'the content above'.")
+
+# --- Lazy Gemini / TTS / event-loop state ---
+# All network-backed state (the Gemini model with its context cache, the TTS
+# client and the event-loop thread) is created on first use rather than at
+# import: the parse stage spawns ProcessPoolExecutor workers that re-import
+# this module, and an eager top level would give every worker its own billable
+# context cache, TTS client and loop thread it never uses (and, under fork,
+# broken copies of live gRPC channels)
+_model = None
+_model_lock = threading.Lock()
+# Server-side lifetime of the Gemini context cache. The model is rebuilt (and
+# the instruction re-uploaded) this margin before the TTL lapses, so runs
+# longer than the TTL never call into an expired cache
+GEMINI_CONTEXT_CACHE_TTL = datetime.timedelta(hours=1)
+CONTEXT_CACHE_REFRESH_MARGIN = 300 # seconds
+# Monotonic deadline for rebuilding the model; None while the inline-instruction
+# fallback model (which has nothing that can expire) is in use
+_model_expires_at = None
+_ai_loop = None
+_ai_loop_lock = threading.Lock()
+_tts_client = None
+_tts_client_lock = threading.Lock()
+
+def _get_model():
+    """Returns the shared Gemini model, configuring the client on first use.
+
+    The context cache the model is built from expires server-side after
+    GEMINI_CONTEXT_CACHE_TTL, so the model is rebuilt on a fresh cache once
+    its deadline (with a safety margin) has passed."""
+    global _model, _model_expires_at
+    with _model_lock:
+        expired = _model_expires_at is not None and time.monotonic() >= _model_expires_at
+        if _model is None or expired:
+            # The gRPC transport keeps one long-lived channel across calls
+            # instead of the REST default's per-call TCP+TLS handshake
+            genai.configure(api_key=gemini_api_key, transport='grpc')
+            try:
+                # Upload the static instruction as an explicit context cache;
+                # cached tokens are billed at a fraction of the normal rate and
+                # skip re-encoding
+                rephrase_cache = genai.caching.CachedContent.create(
+                    model='models/gemini-1.5-flash',
+                    system_instruction=REPHRASE_INSTRUCTION,
+                    ttl=GEMINI_CONTEXT_CACHE_TTL
+                )
+                _model = genai.GenerativeModel.from_cached_content(rephrase_cache)
+                _model_expires_at = (time.monotonic()
+                                     + GEMINI_CONTEXT_CACHE_TTL.total_seconds()
+                                     - CONTEXT_CACHE_REFRESH_MARGIN)
+                print("Gemini context cache refreshed for the rephrase instruction."
+                      if expired else
+                      "Gemini context cache created for the rephrase instruction.")
+            except Exception as e:
+                # Context caching can be unavailable (e.g. the instruction is below
+                # the model's minimum cacheable token count), so fall back to
+                # sending the instruction with every call
+                print(f"Could not create Gemini context cache ({e}). Sending the instruction inline instead.")
+                _model = genai.GenerativeModel('gemini-1.5-flash', system_instruction=REPHRASE_INSTRUCTION)
+                _model_expires_at = None
+    return _model
+
+def _get_ai_loop():
+    """Returns the shared RPC event loop, starting its thread on first use.
+
+    All async RPCs (TTS synthesis and batched Gemini calls) run on this one
+    dedicated, long-lived loop: worker threads can keep requests in flight
+    over shared gRPC channels, and those channels stay bound to a loop that
+    never closes."""
+    global _ai_loop
+    with _ai_loop_lock:
+        if _ai_loop is None:
+            _ai_loop = asyncio.new_event_loop()
+            threading.Thread(target=_ai_loop.run_forever, name="ai-loop", daemon=True).start()
+    return _ai_loop
+
+async def _create_tts_client():
+    """Constructs the async TTS client; must run on the shared AI event loop."""
+    return texttospeech.TextToSpeechAsyncClient()
+
+def _get_tts_client():
+    """Returns the shared async TTS client, creating it on first use.
+
+    The client is built ON the AI loop (not the calling thread), because the
+    grpc.aio channel binds to the event loop that is current at construction
+    time and RPCs awaited from any other loop fail."""
+    global _tts_client
+    loop = _get_ai_loop()
+    with _tts_client_lock:
+        if _tts_client is None:
+            try:
+                _tts_client = asyncio.run_coroutine_threadsafe(_create_tts_client(), loop).result()
+                print("Google Cloud Text-to-Speech async client initialized.")
+            except Exception as e:
+                # Adding a check here to ensure the file exists at the set path
+                if not os.path.exists(google_app_credentials_path):
+                    raise RuntimeError(f"Failed to initialize Google Cloud Text-to-Speech client. "
+                                       f"The JSON key file was NOT found at the specified path: {google_app_credentials_path}. "
+                                       f"Error: {e}")
+                else:
+                    raise RuntimeError(f"Failed to initialize Google Cloud Text-to-Speech client. "
+                                       f"Ensure GOOGLE_APPLICATION_CREDENTIALS is set correctly and the JSON file exists: {e}")
+    return _tts_client
+
+async def synthesize_speech_async(tts_client, synthesis_input, voice, audio_config):
+    """Issues one asynchronous synthesis RPC against the async TTS client."""
+    return await tts_client.synthesize_speech(
+        input=synthesis_input, voice=voice, audio_config=audio_config
+    )
+
+# Google TTS caps request size (5000 chars) and latency grows with input length,
+# so long texts are split on sentence boundaries into chunks around this size
+# and synthesized concurrently
+TTS_CHUNK_MAX_CHARS = 1500
 
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+def split_text_for_tts(text, max_chars=TTS_CHUNK_MAX_CHARS):
+    """
+    Splits text on sentence boundaries into chunks of at most max_chars
+    (a single over-long sentence still becomes its own chunk).
+    """
+    chunks = []
+    current_sentences = []
+    current_length = 0
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        if current_sentences and current_length + len(sentence) + 1 > max_chars:
+            chunks.append(" ".join(current_sentences))
+            current_sentences = []
+            current_length = 0
+        current_sentences.append(sentence)
+        current_length += len(sentence) + 1
+    if current_sentences:
+        chunks.append(" ".join(current_sentences))
+    return chunks
 
 # --- File Paths ---
 BASE_ARTICLE_DIRECTORY = "../data/generated_articles"
@@ -53,72 +184,177 @@ GENERATED_TEXT_DIRECTORY = "../data/generated_text"
 VOICE_SAVE_DIRECTORY = "../data/generated_audio"
 TRACKING_VOICE_FILE = "../data/generated_voice.log" # Tracks which articles have had voice generated
 
+# Number of articles processed concurrently (Gemini and TTS calls are I/O bound,
+# so overlapping the network round trips gives a near-linear speedup up to quota limits)
+MAX_WORKERS = 8
+
+# Number of articles rephrased per Gemini call. Batching amortizes the HTTP/TLS
+# round trip and prompt overhead across several articles.
+REPHRASE_BATCH_SIZE = 8
+
+# Persistent cache of Gemini responses keyed by article content hash, so a re-run
+# never re-sends (and re-pays for) text that was already rephrased
+GEMINI_CACHE_FILE = "../data/gemini_cache.sqlite"
+
+# --- Gemini Response Cache ---
+_gemini_cache_conn = None
+_gemini_cache_lock = threading.Lock()
+
+def _get_gemini_cache_conn():
+    """Returns the on-disk cache connection, opening it on first use so that
+    spawned parse workers never open one. Callers hold _gemini_cache_lock.
+    WAL mode allows safe concurrent reads/writes from the thread pool workers."""
+    global _gemini_cache_conn
+    if _gemini_cache_conn is None:
+        conn = sqlite3.connect(GEMINI_CACHE_FILE, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (hash TEXT PRIMARY KEY, response TEXT)")
+        conn.commit()
+        _gemini_cache_conn = conn
+    return _gemini_cache_conn
+
+def get_cached_rephrase(text):
+    """Returns the cached Gemini response for this exact article text, or None."""
+    content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    with _gemini_cache_lock:
+        row = _get_gemini_cache_conn().execute("SELECT response FROM cache WHERE hash=?", (content_hash,)).fetchone()
+    return row[0] if row else None
+
+def store_cached_rephrase(text, response):
+    """Stores a Gemini response in the on-disk cache keyed by the article text hash."""
+    content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    with _gemini_cache_lock:
+        conn = _get_gemini_cache_conn()
+        conn.execute("INSERT OR REPLACE INTO cache (hash, response) VALUES (?, ?)",
+                     (content_hash, response))
+        conn.commit()
+
+# Per-category output directory caches so sanitization and makedirs (with its
+# stat syscall even when exist_ok short-circuits) run once per category rather
+# than once per article
+_TEXT_DIRS = {}
+_AUDIO_DIRS = {}
+_dir_cache_lock = threading.Lock()
+
+def _ensure_category_dir(base_directory, category_folder, cache, fallback_name):
+    """
+    Returns the sanitized output directory for a category, creating it on first
+    use and memoizing the result for later articles in the same category.
+    """
+    with _dir_cache_lock:
+        target_directory = cache.get(category_folder)
+        if target_directory is None:
+            sanitized_category_folder = _SANITIZE_RE.sub("", category_folder).strip()
+            if not sanitized_category_folder:
+                sanitized_category_folder = fallback_name
+            target_directory = os.path.join(base_directory, sanitized_category_folder)
+            os.makedirs(target_directory, exist_ok=True)
+            cache[category_folder] = target_directory
+    return target_directory
+
+# Characters that are unsafe in file/directory names, compiled once at import
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')
+
+# For titles the '/' is kept as '_' so it still acts as a separator; a single
+# str.translate pass replaces the old replace() + re.sub() combination
+_TITLE_SANITIZE_TABLE = str.maketrans({c: None for c in '\\*?:"<>|'} | {'/': '_'})
+
 # --- Helper Functions ---
 
+# Shared append handle for the voice tracking log, opened lazily and kept for the
+# whole run instead of paying an open/close syscall pair per logged title
+_voice_log_fh = None
+_voice_log_pending = 0
+_VOICE_LOG_FLUSH_EVERY = 16 # Titles written between explicit flushes
+
 # 1. Function to get previously processed voice titles
 def get_processed_voice_titles(tracking_file):
-    """Reads the voice tracking file and returns a set of titles already processed for voice."""
+    """Reads the voice tracking file in one bulk read and returns a set of titles already processed for voice."""
     if not os.path.exists(tracking_file):
         return set()
-    with open(tracking_file, 'r', encoding='utf-8') as f:
-        return set(line.strip() for line in f)
+    with open(tracking_file, 'rb') as f:
+        return set(f.read().decode('utf-8').splitlines())
 
 # 2. Function to log a newly processed voice title
 def log_processed_voice_title(title, tracking_file):
-    """Appends a new title to the voice tracking file."""
-    with open(tracking_file, 'a', encoding='utf-8') as f:
-        f.write(title + '\n')
+    """Appends a new title to the voice tracking file through the shared handle."""
+    global _voice_log_fh, _voice_log_pending
+    if _voice_log_fh is None:
+        _voice_log_fh = open(tracking_file, 'a', buffering=1 << 16, encoding='utf-8')
+        atexit.register(_voice_log_fh.close)
+    _voice_log_fh.write(title + '\n')
+    _voice_log_pending += 1
+    if _voice_log_pending >= _VOICE_LOG_FLUSH_EVERY:
+        _voice_log_fh.flush()
+        _voice_log_pending = 0
+
+# Maps a line's prefix (the part before the first colon) to the section it opens
+SECTION_MAP = {"Title": "Title", "Main": "Main", "Table": "Table",
+               "Appearances": "Appearances", "Images": "Images"}
+
+# First characters of the recognized prefixes: most lines are continuations that
+# cannot open a section, and this one membership test lets them skip the
+# partition and dict lookup entirely
+_SECTION_FIRST_CHARS = frozenset("TMAI")
 
 # 3. Function to parse a saved article file into its components
 def parse_article_file(filepath):
     """
-    Parses a saved article file into its components.
+    Parses a saved article file into its components with a single pass over the
+    lines, dispatching on the prefix via one dict lookup instead of a chain of
+    startswith checks.
     Returns (title, main_content_for_gemini, images_part)
     """
     title = ""
-    main_content_lines = []
-    table_content_lines = []
-    appearances_content_lines = []
     images_part = ""
+    # StringIO buffers grow in place, avoiding the list-of-strings churn and
+    # final join that long articles used to pay per section
+    section_buffers = {"Main": io.StringIO(), "Table": io.StringIO(), "Appearances": io.StringIO()}
 
     current_section = None
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("Title:"):
-                title = line[len("Title:"):].strip()
-                current_section = None # Reset after title
-            elif line.startswith("Main:"):
-                current_section = "Main"
-                main_content_lines.append(line[len("Main:"):].strip())
-            elif line.startswith("Table:"):
-                current_section = "Table"
-                table_content_lines.append(line[len("Table:"):].strip())
-            elif line.startswith("Appearances:"):
-                current_section = "Appearances"
-                appearances_content_lines.append(line[len("Appearances:"):].strip())
-            elif line.startswith("Images:"):
-                current_section = "Images"
-                images_part = line[len("Images:"):].strip()
-            elif current_section: # Append to current section if continuation line
-                if current_section == "Main":
-                    main_content_lines.append(line)
-                elif current_section == "Table":
-                    table_content_lines.append(line)
-                elif current_section == "Appearances":
-                    appearances_content_lines.append(line)
-    
+    # Memory-map the article so lines are scanned straight out of the page
+    # cache, with no buffered-reader copy in between. Empty files cannot be
+    # mapped and have nothing to parse anyway.
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mm = None
+
+    if mm is not None:
+        with mm:
+            for raw_line in iter(mm.readline, b''):
+                line = raw_line.decode('utf-8').strip()
+                if line[:1] in _SECTION_FIRST_CHARS:
+                    head, sep, rest = line.partition(':')
+                    section = SECTION_MAP.get(head) if sep else None
+                else:
+                    section = None
+                if section == "Title":
+                    title = rest.strip()
+                    current_section = None # Reset after title
+                elif section == "Images":
+                    images_part = rest.strip()
+                    current_section = None # Continuation lines after Images are not collected
+                elif section:
+                    current_section = section
+                    buffer = section_buffers[section]
+                    buffer.write(rest.strip())
+                    buffer.write(' ')
+                elif current_section: # Append to current section if continuation line
+                    buffer = section_buffers[current_section]
+                    buffer.write(line)
+                    buffer.write(' ')
+
     # Concatenate content for Gemini
     gemini_input_parts = []
     if title:
         gemini_input_parts.append(f"Title: {title}")
-    if main_content_lines:
-        gemini_input_parts.append(f"Main: {' '.join(main_content_lines)}")
-    if table_content_lines:
-        gemini_input_parts.append(f"Table: {' '.join(table_content_lines)}")
-    if appearances_content_lines:
-        gemini_input_parts.append(f"Appearances: {' '.join(appearances_content_lines)}")
-        
+    for section in ("Main", "Table", "Appearances"):
+        section_text = section_buffers[section].getvalue().rstrip()
+        if section_text:
+            gemini_input_parts.append(f"{section}: {section_text}")
+
     content_for_gemini = "\n".join(gemini_input_parts)
 
     return title, content_for_gemini, images_part
@@ -128,11 +364,17 @@ def rephrase_with_gemini(text_to_rephrase):
     """
     Sends text to Gemini API for rephrasing.
     """
-    prompt = f"Rephrase the following Star Wars Wookieepedia article content in an engaging, concise, and informative way, suitable for a narration. Focus on the core facts and avoid phrases like 'this article describes' or 'the content above':\n\n{text_to_rephrase}"
-    
+    cached = get_cached_rephrase(text_to_rephrase)
+    if cached:
+        print("Gemini cache hit; skipping API call.")
+        return cached
+
     try:
-        response = model.generate_content(prompt)
+        # The rephrase instruction lives in the model's cached/system instruction,
+        # so only the variable article body is sent per call
+        response = _get_model().generate_content(text_to_rephrase)
         if response.parts and response.parts[0].text:
+            store_cached_rephrase(text_to_rephrase, response.parts[0].text)
             return response.parts[0].text
         else:
             print(f"Gemini response was empty or malformed for text: {text_to_rephrase[:100]}...")
@@ -141,26 +383,131 @@ def rephrase_with_gemini(text_to_rephrase):
         print(f"Error calling Gemini API: {e}")
         return None
 
+# 4b. Function to rephrase several articles with a single batched Gemini call
+async def rephrase_batch_async(texts, on_article=None):
+    """
+    Rephrases a batch of article texts with one streamed Gemini call.
+    Each article is wrapped in an '=== ARTICLE {i} ===' sentinel line and the model
+    is instructed to echo the sentinels back, so the reply can be split per article.
+    The reply is consumed as a stream: as soon as an article's closing sentinel
+    (the next article's opener) arrives, on_article(i, text) is invoked so
+    downstream work can start while Gemini is still generating the rest.
+    Returns a list the same length as texts, with None for any article whose
+    rephrased text could not be recovered from the reply.
+    """
+    numbered_articles = "\n\n".join(f"=== ARTICLE {i} ===\n{text}" for i, text in enumerate(texts))
+    prompt = (f"Below are {len(texts)} separate Star Wars Wookieepedia articles. Rephrase each "
+              f"one individually, and start each rephrased article with the exact same "
+              f"'=== ARTICLE N ===' line that precedes it below:\n\n{numbered_articles}")
+
+    reply = ""
+    next_to_emit = 0
+    try:
+        stream = await _get_model().generate_content_async(prompt, stream=True)
+        async for piece in stream:
+            try:
+                reply += piece.text
+            except (AttributeError, ValueError):
+                continue # Chunks without text (e.g. safety metadata) are skipped
+
+            # Emit every article whose closing sentinel has already streamed in
+            while next_to_emit < len(texts) - 1:
+                match = re.search(rf"=== ARTICLE {next_to_emit} ===\s*(.*?)=== ARTICLE {next_to_emit + 1} ===",
+                                  reply, re.DOTALL)
+                if not match:
+                    break
+                if on_article is not None and match.group(1).strip():
+                    on_article(next_to_emit, match.group(1).strip())
+                next_to_emit += 1
+
+        if not reply:
+            print(f"Gemini batch response was empty or malformed for {len(texts)} articles.")
+    except Exception as e:
+        print(f"Error calling Gemini API for a batch of {len(texts)} articles: {e}")
+
+    results = [None] * len(texts)
+    for i in range(len(texts)):
+        match = re.search(rf"=== ARTICLE {i} ===\s*(.*?)(?:=== ARTICLE \d+ ===|$)", reply, re.DOTALL)
+        if match and match.group(1).strip():
+            results[i] = match.group(1).strip()
+    return results
+
+# 4c. Function to drive the batched rephrasing with a per-article fallback
+def rephrase_batch(texts, on_ready=None):
+    """
+    Rephrases a batch of texts via rephrase_batch_async, falling back to a
+    single-article Gemini call for any article missing from the batched reply.
+    Texts already in the on-disk cache never reach the API.
+    on_ready(i, text) is invoked exactly once per article as soon as its
+    rephrased text is final (streamed, cached or recovered by fallback), so
+    the caller can pipeline TTS work while Gemini is still generating.
+    """
+    results = [get_cached_rephrase(text) for text in texts]
+    notified = set()
+
+    def notify(i):
+        if on_ready is not None and i not in notified:
+            notified.add(i)
+            on_ready(i, results[i])
+
+    pending = []
+    for i, rephrased in enumerate(results):
+        if rephrased is None:
+            pending.append(i)
+        else:
+            notify(i)
+    if not pending:
+        print(f"All {len(texts)} articles in this batch were served from the Gemini cache.")
+        return results
+
+    def on_streamed_article(j, text):
+        i = pending[j]
+        store_cached_rephrase(texts[i], text)
+        results[i] = text
+        notify(i)
+
+    # Built here, off the loop, so a first-call blocking cache upload never
+    # stalls the shared loop thread
+    _get_model()
+    # Scheduled onto the shared loop rather than asyncio.run: the model caches
+    # its async client (and grpc.aio channel) in whichever loop runs the first
+    # batch, so every batch must run on the same, still-open loop
+    batch_results = asyncio.run_coroutine_threadsafe(
+        rephrase_batch_async([texts[i] for i in pending], on_article=on_streamed_article),
+        _get_ai_loop()).result()
+    for j, i in enumerate(pending):
+        if results[i] is not None:
+            continue # Already emitted from the stream
+        rephrased = batch_results[j]
+        if rephrased is None:
+            print(f"Could not recover article {i} from the batched reply. Falling back to a single call.")
+            rephrased = rephrase_with_gemini(texts[i])
+        else:
+            store_cached_rephrase(texts[i], rephrased)
+        results[i] = rephrased
+        notify(i)
+    return results
+
 # 5. Function to save the rephrased text for subtitles
 def save_rephrased_text_for_subtitles(rephrased_text, original_title, category_folder):
     """
     Saves the rephrased text to a new file in the generated_text directory,
     under a category-specific subfolder.
     """
-    # Sanitize category_folder to be safe for a directory name
-    sanitized_category_folder = re.sub(r'[\\/*?:"<>|]', "", category_folder).strip()
-    if not sanitized_category_folder:
-        sanitized_category_folder = "Uncategorized_Text"
-
-    target_directory = os.path.join(GENERATED_TEXT_DIRECTORY, sanitized_category_folder)
-    os.makedirs(target_directory, exist_ok=True) # Ensure the directory exists
+    target_directory = _ensure_category_dir(GENERATED_TEXT_DIRECTORY, category_folder,
+                                            _TEXT_DIRS, "Uncategorized_Text")
 
-    sanitized_title = re.sub(r'[\\/*?:"<>|]', "", original_title.replace('/', '_'))
+    sanitized_title = original_title.translate(_TITLE_SANITIZE_TABLE)
     filename = os.path.join(target_directory, f"{sanitized_title}_rephrased.txt")
 
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(rephrased_text)
+        # Single open/write/close syscall triple; for these small one-shot files
+        # the buffered file object layer is pure overhead
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, rephrased_text.encode('utf-8'))
+        finally:
+            os.close(fd)
         print(f"Rephrased text saved to '{filename}'.")
         return True
     except Exception as e:
@@ -172,19 +519,12 @@ def generate_wavenet_audio(text_to_convert, original_title, category_folder):
     """
     Converts text to speech using Google Cloud WaveNet and saves it as an MP3 file.
     """
-    # Sanitize category_folder for directory name
-    sanitized_category_folder = re.sub(r'[\\/*?:"<>|]', "", category_folder).strip()
-    if not sanitized_category_folder:
-        sanitized_category_folder = "Uncategorized_Audio"
+    target_directory = _ensure_category_dir(VOICE_SAVE_DIRECTORY, category_folder,
+                                            _AUDIO_DIRS, "Uncategorized_Audio")
 
-    target_directory = os.path.join(VOICE_SAVE_DIRECTORY, sanitized_category_folder)
-    os.makedirs(target_directory, exist_ok=True)
-
-    sanitized_title = re.sub(r'[\\/*?:"<>|]', "", original_title.replace('/', '_'))
+    sanitized_title = original_title.translate(_TITLE_SANITIZE_TABLE)
     filename = os.path.join(target_directory, f"{sanitized_title}.mp3")
 
-    synthesis_input = texttospeech.SynthesisInput(text=text_to_convert)
-
     # Select the voice parameters. You can change these!
     # Available voices: https://cloud.google.com/text-to-speech/docs/voices
     # 'en-US-Wavenet-D' is a common male voice. 'en-US-Wavenet-C' is a common female voice.
@@ -196,23 +536,72 @@ def generate_wavenet_audio(text_to_convert, original_title, category_folder):
 
     audio_config = texttospeech.AudioConfig(
         audio_encoding=texttospeech.AudioEncoding.MP3,
+        # 22.05 kHz is plenty for WaveNet speech and roughly halves the MP3
+        # bytes the transcript and video stages have to read back
+        sample_rate_hertz=22050,
         speaking_rate=1.0, # Adjust speed if desired (0.25 to 4.0)
         pitch=0.0 # Adjust pitch if desired (-20.0 to 20.0)
     )
 
-    try:
-        response = tts_client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
-        )
+    chunks = split_text_for_tts(text_to_convert)
+
+    # Resolved on this worker thread, not inside the coroutine: building the
+    # client blocks on the loop, so doing it from loop-side code would deadlock
+    tts_client = _get_tts_client()
+
+    async def synthesize_chunks():
+        return await asyncio.gather(*[
+            synthesize_speech_async(tts_client, texttospeech.SynthesisInput(text=chunk), voice, audio_config)
+            for chunk in chunks
+        ])
 
-        with open(filename, "wb") as out:
-            out.write(response.audio_content)
+    try:
+        # Hand the RPCs to the shared event loop and wait for the results;
+        # all chunks of one article are synthesized concurrently
+        responses = asyncio.run_coroutine_threadsafe(synthesize_chunks(), _get_ai_loop()).result()
+
+        if len(chunks) > 1:
+            print(f"Synthesized '{original_title}' as {len(chunks)} concurrent chunks.")
+
+        # MP3 frames are self-synchronizing, so the chunk byte streams can
+        # simply be concatenated in order. A vectored write hands all chunk
+        # buffers to the kernel in one syscall without joining them first.
+        audio_buffers = [response.audio_content for response in responses]
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'writev'):
+                os.writev(fd, audio_buffers)
+            else:
+                os.write(fd, b''.join(audio_buffers))
+        finally:
+            os.close(fd)
         print(f"Audio content saved to '{filename}'.")
         return True
     except Exception as e:
         print(f"Error generating WaveNet audio for '{original_title}': {e}")
         return False
 
+# 7. Function to process a single rephrased article (save text -> generate audio)
+def process_article(filepath, category_folder, original_title, rephrased_text):
+    """
+    Processes one already-rephrased article: saves the text for subtitles and
+    generates the WaveNet audio. Returns (title, ok) so the main thread can
+    update the tracking file once the work is done.
+    """
+    # Save the rephrased text for subtitles
+    text_saved = save_rephrased_text_for_subtitles(rephrased_text, original_title, category_folder)
+    if not text_saved:
+        print(f"Failed to save rephrased text for '{original_title}'. Skipping audio generation.")
+        return original_title, False
+
+    print(f"Successfully rephrased '{original_title}'. Now generating audio...")
+    audio_generated = generate_wavenet_audio(rephrased_text, original_title, category_folder)
+    if not audio_generated:
+        print(f"Audio generation failed for '{original_title}'. Not logging.")
+        return original_title, False
+
+    return original_title, True
+
 # --- Main Processing Logic ---
 if __name__ == "__main__":
     # Ensure all base output directories exist
@@ -222,51 +611,97 @@ if __name__ == "__main__":
     processed_voice_titles = get_processed_voice_titles(TRACKING_VOICE_FILE)
     print(f"Loaded {len(processed_voice_titles)} previously generated audio titles.")
 
-    for root, dirs, files in os.walk(BASE_ARTICLE_DIRECTORY):
-        category_folder = os.path.basename(root) 
-        
-        # Skip the base directory itself if it's not a category folder
-        if category_folder == os.path.basename(BASE_ARTICLE_DIRECTORY) and root != BASE_ARTICLE_DIRECTORY:
-             continue 
-
-        for filename in files:
-            if filename.endswith(".txt"):
-                filepath = os.path.join(root, filename)
-                print(f"\nProcessing file: {filepath}")
-
-                original_title, content_for_gemini, images_part = parse_article_file(filepath)
-
-                if not original_title:
-                    print(f"Could not parse title from {filename}. Skipping.")
-                    continue
-
-                if original_title in processed_voice_titles:
-                    print(f"'{original_title}' has already had audio generated. Skipping.")
-                    continue
-                
-                if not content_for_gemini.strip():
-                    print(f"No substantial text content found for Gemini in '{original_title}'. Skipping.")
-                    continue
-
-                print(f"Sending to Gemini for rephrasing: {original_title}")
-                rephrased_text = rephrase_with_gemini(content_for_gemini)
-
-                if rephrased_text:
-                    # Save the rephrased text for subtitles
-                    text_saved = save_rephrased_text_for_subtitles(rephrased_text, original_title, category_folder)
-                    
-                    if text_saved:
-                        print(f"Successfully rephrased '{original_title}'. Now generating audio...")
-                        audio_generated = generate_wavenet_audio(rephrased_text, original_title, category_folder)
-                        
-                        if audio_generated:
-                            log_processed_voice_title(original_title, TRACKING_VOICE_FILE)
-                            print(f"Audio generation and logging complete for '{original_title}'.")
-                        else:
-                            print(f"Audio generation failed for '{original_title}'. Not logging.")
-                    else:
-                        print(f"Failed to save rephrased text for '{original_title}'. Skipping audio generation.")
-                else:
+    # Article filenames are the sanitized titles, so a processed article can be
+    # recognized from its filename alone without reading and parsing the file
+    processed_sanitized_titles = {title.translate(_TITLE_SANITIZE_TABLE) for title in processed_voice_titles}
+
+    # Guards the tracking file and the in-memory processed set across workers
+    tracking_lock = threading.Lock()
+
+    # Collect the candidate files first so already-processed articles never reach
+    # the parsers. Articles live one level deep in per-category folders, so two
+    # nested scandir loops (which reuse the stat info from the directory read)
+    # replace the recursive os.walk and its skip-the-base-directory branch.
+    candidates = []
+    with os.scandir(BASE_ARTICLE_DIRECTORY) as categories:
+        for category_entry in categories:
+            if not category_entry.is_dir(follow_symlinks=False):
+                continue
+            category_folder = category_entry.name
+
+            with os.scandir(category_entry.path) as entries:
+                for entry in entries:
+                    if not (entry.name.endswith(".txt") and entry.is_file()):
+                        continue
+
+                    stem = os.path.splitext(entry.name)[0]
+                    if stem in processed_sanitized_titles:
+                        print(f"'{stem}' has already had audio generated. Skipping without parsing.")
+                        continue
+
+                    candidates.append((entry.path, entry.name, category_folder))
+
+    # Parsing is pure-Python text crunching, so threads cannot overlap it under
+    # the GIL; a process pool parses all candidates with real CPU parallelism
+    jobs = []
+    # Different titles occasionally carry identical content (wiki mirrors and
+    # redirects), so the Gemini input is hashed and duplicates are queued only
+    # once per run. Cross-run duplicates are already absorbed by the persistent
+    # response cache, which is keyed on the same content.
+    seen_content_hashes = set()
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as parse_pool:
+        parsed_articles = parse_pool.map(parse_article_file, [c[0] for c in candidates])
+        for (filepath, filename, category_folder), (original_title, content_for_gemini, images_part) in zip(candidates, parsed_articles):
+            print(f"\nProcessing file: {filepath}")
+
+            if not original_title:
+                print(f"Could not parse title from {filename}. Skipping.")
+                continue
+
+            if original_title in processed_voice_titles:
+                print(f"'{original_title}' has already had audio generated. Skipping.")
+                continue
+
+            if not content_for_gemini.strip():
+                print(f"No substantial text content found for Gemini in '{original_title}'. Skipping.")
+                continue
+
+            content_hash = hashlib.blake2b(content_for_gemini.encode('utf-8')).digest()
+            if content_hash in seen_content_hashes:
+                print(f"'{original_title}' duplicates an article already queued this run. Skipping.")
+                continue
+            seen_content_hashes.add(content_hash)
+
+            jobs.append((filepath, category_folder, original_title, content_for_gemini))
+
+    print(f"\nQueued {len(jobs)} articles for processing with {MAX_WORKERS} workers.")
+
+    # Rephrase in batches and hand every article to the save/TTS pool the moment
+    # its streamed text is complete, so TTS head-latency overlaps the decode
+    # tail-latency of the rest of the batch. The Gemini and Google TTS clients
+    # are thread-safe, so several articles can be in flight at once.
+    futures = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for start in range(0, len(jobs), REPHRASE_BATCH_SIZE):
+            batch_jobs = jobs[start:start + REPHRASE_BATCH_SIZE]
+            print(f"\nSending batch of {len(batch_jobs)} articles to Gemini for rephrasing...")
+
+            def submit_article(i, rephrased_text, batch_jobs=batch_jobs):
+                filepath, category_folder, original_title, _ = batch_jobs[i]
+                if not rephrased_text:
                     print(f"Failed to get rephrased text for '{original_title}'. Skipping text and audio generation.")
-    
+                    return
+                futures.append(executor.submit(process_article, filepath, category_folder,
+                                               original_title, rephrased_text))
+
+            rephrase_batch([job[3] for job in batch_jobs], on_ready=submit_article)
+
+        for future in as_completed(futures):
+            title, ok = future.result()
+            if ok:
+                with tracking_lock:
+                    log_processed_voice_title(title, TRACKING_VOICE_FILE)
+                    processed_voice_titles.add(title)
+                print(f"Audio generation and logging complete for '{title}'.")
+
     print("\n--- Processing complete. ---")
\ No newline at end of file
@@ -1,33 +1,62 @@
 import subprocess
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# List of scripts to run, in order
-scripts_to_run = [
-    "scraper.py",
-    "ai-api-calls.py",
-    "transcript-gen.py",
-    "video-gen.py",
-    "youtube-upload.py",
-]
+# Dependency graph of the pipeline stages. A script is launched as soon as every
+# script it depends on has finished, so stages with no ordering between them can
+# overlap instead of always running strictly one after another.
+SCRIPT_DEPENDENCIES = {
+    "scraper.py": [],
+    "ai-api-calls.py": ["scraper.py"],
+    "transcript-gen.py": ["ai-api-calls.py"],
+    "video-gen.py": ["transcript-gen.py", "ai-api-calls.py"],
+    "youtube-upload.py": ["video-gen.py"],
+}
 
 # Get the directory of the current script (run-workflow.py)
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
-print("Starting the automated workflow...")
+def run_script(script, done_events):
+    """Waits for the script's dependencies to finish, then runs it."""
+    for dependency in SCRIPT_DEPENDENCIES[script]:
+        done_events[dependency].wait()
 
-for script in scripts_to_run:
     print(f"\n--- Running: {script} ---")
-    
+
     try:
-        # We don't need to build the full path here because we're setting the cwd
-        subprocess.run([sys.executable, script], 
-                       cwd=script_dir, 
-                       check=False, 
-                       capture_output=False)
+        if hasattr(os, "posix_spawn"):
+            # posix_spawn launches the interpreter directly, skipping the
+            # fork+copy-on-write of the whole parent process and the
+            # CompletedProcess bookkeeping subprocess.run does on top
+            pid = os.posix_spawn(sys.executable, [sys.executable, script], os.environ)
+            os.waitpid(pid, 0)
+        else:
+            # We don't need to build the full path here because we're setting the cwd
+            subprocess.run([sys.executable, script],
+                           cwd=script_dir,
+                           check=False,
+                           capture_output=False)
     except FileNotFoundError:
         print(f"ERROR: Script not found: {script}. Skipping.")
     except Exception as e:
         print(f"ERROR: An unexpected issue occurred while trying to run {script}: {e}")
+    finally:
+        # Mark the stage done even on failure so dependents are not stuck forever
+        done_events[script].set()
+
+if __name__ == "__main__":
+    print("Starting the automated workflow...")
+
+    # The pipeline scripts use paths relative to the scripts directory, and
+    # posix_spawn has no cwd argument, so switch there once up front
+    os.chdir(script_dir)
+
+    done_events = {script: threading.Event() for script in SCRIPT_DEPENDENCIES}
+
+    with ThreadPoolExecutor(max_workers=len(SCRIPT_DEPENDENCIES)) as executor:
+        for script in SCRIPT_DEPENDENCIES:
+            executor.submit(run_script, script, done_events)
 
-print("\nWorkflow completed.")
\ No newline at end of file
+    print("\nWorkflow completed.")
@@ -2,11 +2,29 @@
 import requests
 import random
 import json
-import bs4
+import atexit
+import io
+import lxml.etree
+import lxml.html
 import urllib.parse
 import re
 import os
+import shelve
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One keep-alive session shared by every API call: reusing the TCP+TLS
+# connection to starwars.fandom.com saves a handshake per request, and the
+# adapter retries transient server and rate-limit errors with backoff
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=64,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
 
 # Generated articles are tracked here
 TRACKING_ARTICLE_FILE = "../data/generated_articles.log"
@@ -31,30 +49,69 @@ AVOID_FOLDER_CATEGORIES = {
     "Articles needing illustration", "Articles with conjectural titles", "Articles with gameplay alternatives",
     "Archiveurl usages with non-Wayback URLs", "Canon articles", "Legends articles", "Canon articles with Legends counterparts"
 }
+# 3. Precomputed folder-name filters: the union of every avoid set and a single
+#    compiled alternation for the generic keywords, built once per process
+#    instead of per candidate category.
+_ALL_AVOID_FOLDER_CATEGORIES = AVOID_FOLDER_CATEGORIES | EXCLUDE_CATEGORIES_FOR_ANY_USE
+_GENERIC_CATEGORY_RE = re.compile(r'real-world|disambiguation|date|fictional', re.IGNORECASE)
 # --- END CATEGORY DEFINITION AND FILTERING SECTIONS ---
 
+# Characters that are unsafe in file/directory names, removed with one C-level
+# translate pass instead of a per-call regex
+_FNAME_SANITIZE_TABLE = str.maketrans('', '', '\\/*?:"<>|')
+
+# For titles '/' is kept as '_' so it still acts as a separator
+_TITLE_SANITIZE_TABLE = str.maketrans({c: None for c in '\\*?:"<>|'} | {'/': '_'})
+
+# Strips parenthesized qualifiers from appearance entries, compiled once
+_PAREN_RE = re.compile(r'\s*\([^)]*\)')
+
 # --- ARTICLE PROCESSING FUNCTIONS ---
 
+# In-memory mirror of the tracking log (loaded once) and the long-lived append
+# handle, so repeated calls stop re-reading and re-opening the file. Writes are
+# buffered and flushed every few titles as a crash-safety middle ground.
+_GENERATED_TITLES = None
+_titles_log_fh = None
+_titles_log_pending = 0
+_TITLES_LOG_FLUSH_EVERY = 16
+
 # 1. Function to get previously generated titles from the tracking file
 def get_previously_generated_titles(TRACKING_ARTICLE_FILE):
-    """Reads the tracking file and returns a set of titles that have already been generated."""
-    if not os.path.exists(TRACKING_ARTICLE_FILE):
-        return set()
-    with open(TRACKING_ARTICLE_FILE, 'r', encoding='utf-8') as f:
-        return set(line.strip() for line in f)
+    """Returns the set of already generated titles, reading the tracking file
+    only on the first call and serving later calls from memory."""
+    global _GENERATED_TITLES
+    if _GENERATED_TITLES is None:
+        if os.path.exists(TRACKING_ARTICLE_FILE):
+            with open(TRACKING_ARTICLE_FILE, 'r', encoding='utf-8') as f:
+                _GENERATED_TITLES = set(line.strip() for line in f)
+        else:
+            _GENERATED_TITLES = set()
+    return _GENERATED_TITLES
 
 # 2. Function to log a newly generated title
 def log_generated_title(title, TRACKING_ARTICLE_FILE):
-    """Appends a new title to the tracking file."""
-    with open(TRACKING_ARTICLE_FILE, 'a', encoding='utf-8') as f:
-        f.write(title + '\n')
+    """Appends a new title to the tracking file and the in-memory set."""
+    global _titles_log_fh, _titles_log_pending
+    if _titles_log_fh is None:
+        # Buffered writes with a periodic flush instead of one open/write/close
+        # (and implicit sync) per title; flushed and closed on shutdown
+        _titles_log_fh = open(TRACKING_ARTICLE_FILE, 'a', buffering=1 << 15, encoding='utf-8')
+        atexit.register(_titles_log_fh.close)
+        atexit.register(_titles_log_fh.flush)
+    _titles_log_fh.write(title + '\n')
+    _titles_log_pending += 1
+    if _titles_log_pending >= _TITLES_LOG_FLUSH_EVERY:
+        _titles_log_fh.flush()
+        _titles_log_pending = 0
+    get_previously_generated_titles(TRACKING_ARTICLE_FILE).add(title)
 
 # 3. Function to save the article content in a structured, token-efficient format
 def save_article_to_file(title, parsed_data, image_urls, category_name="Uncategorized"):
     """Saves the structured, token-efficient article content to a text file in a category-specific folder."""
     
     # Sanitize category_name to be safe for a directory name
-    sanitized_category_name = re.sub(r'[\\/*?:"<>|]', "", category_name).strip()
+    sanitized_category_name = category_name.translate(_FNAME_SANITIZE_TABLE).strip()
     if not sanitized_category_name: # Fallback if sanitization results in an empty string
         sanitized_category_name = "Uncategorized"
 
@@ -62,30 +119,34 @@ def save_article_to_file(title, parsed_data, image_urls, category_name="Uncatego
     target_directory = os.path.join(BASE_ARTICLE_DIRECTORY, sanitized_category_name)
     os.makedirs(target_directory, exist_ok=True)
 
-    sanitized_title = re.sub(r'[\\/*?:"<>|]', "", title.replace('/', '_'))
+    sanitized_title = title.translate(_TITLE_SANITIZE_TABLE)
     filename = os.path.join(target_directory, f"{sanitized_title}.txt")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(f"Title: {title}\n")
+    # Assemble the whole article body in one StringIO buffer so it leaves in a
+    # single write instead of ten-plus small f.write syscalls per article
+    body = io.StringIO()
+    body.write(f"Title: {title}\n")
+
+    # Each content section from the parsed data
+    for section, text in parsed_data['content_sections'].items():
+        body.write(f"{section}: {text}\n")
+
+    # The compacted table data
+    if parsed_data['infobox_string']:
+        body.write(f"Table: {parsed_data['infobox_string']}\n")
+
+    # The comma-separated appearances
+    if parsed_data['appearances']:
+        body.write(f"Appearances: {', '.join(parsed_data['appearances'])}\n")
+
+    # The comma-separated image URLs
+    if image_urls:
+        body.write(f"Images: {', '.join(image_urls)}\n")
+
+    with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        f.write(body.getvalue())
+
 
-        # Write each content section from the parsed data
-        for section, text in parsed_data['content_sections'].items():
-            f.write(f"{section}: {text}\n")
-        
-        # Write the compacted table data
-        if parsed_data['infobox_string']:
-            f.write(f"Table: {parsed_data['infobox_string']}\n")
-            
-        # Write the comma-separated appearances
-        if parsed_data['appearances']:
-            appearances_line = ", ".join(parsed_data['appearances'])
-            f.write(f"Appearances: {appearances_line}\n")
-            
-        # Write the comma-separated image URLs
-        if image_urls:
-            images_line = ", ".join(image_urls)
-            f.write(f"Images: {images_line}\n")
-            
     print(f"Article content saved to '{filename}' in AI-friendly format.")
 
 # 4. Function to get a random title from Wookieepedia, checking against the tracking file and defined exclusion categories
@@ -98,7 +159,7 @@ def get_random_title(TRACKING_ARTICLE_FILE, max_attempts=30):
     for attempt in range(max_attempts):
         print(f"\nAttempt {attempt + 1}/{max_attempts} to find a new random article...")
         params = {"action": "query", "format": "json", "list": "random", "rnnamespace": 0, "rnlimit": 1}
-        res = requests.get(url, params=params).json()
+        res = SESSION.get(url, params=params, timeout=10).json()
         random_title = res['query']['random'][0]['title']
         
         if random_title in generated_titles:
@@ -106,39 +167,54 @@ def get_random_title(TRACKING_ARTICLE_FILE, max_attempts=30):
             continue
         
         try:
-            # Fetch categories for filtering
-            params = {"action": "query", "format": "json", "titles": random_title, "prop": "categories", "cllimit": "max"}
-            category_check_res = requests.get(url, params=params).json()
+            # Fetch categories and images in one call: the categories are needed
+            # for filtering here and the images later by get_article_content, so
+            # combining the props saves a round trip per article
+            params = {"action": "query", "format": "json", "titles": random_title,
+                      "prop": "categories|images", "cllimit": "max", "imlimit": "max"}
+            category_check_res = SESSION.get(url, params=params, timeout=10).json()
             page = next(iter(category_check_res["query"]["pages"].values()))
             
-            page_categories = set()
-            if 'categories' in page:
-                page_categories = {cat['title'].replace("Category:", "") for cat in page['categories']}
-                
-            # Check for exclusion categories (using the centralized EXCLUDE_CATEGORIES_FOR_ANY_USE)
-            if not page_categories.isdisjoint(EXCLUDE_CATEGORIES_FOR_ANY_USE):
-                print(f"'{random_title}' is in an excluded category ({page_categories.intersection(EXCLUDE_CATEGORIES_FOR_ANY_USE)}). Skipping.")
+            # Check the exclusion categories lazily: rejects are the common case
+            # for random articles, so bail on the first excluded category instead
+            # of materializing the full set first. The slice strips the
+            # "Category:" prefix without scanning the whole string.
+            raw_categories = page.get('categories', [])
+            excluded_hit = None
+            for cat in raw_categories:
+                category_name = cat['title'][9:]
+                if category_name in EXCLUDE_CATEGORIES_FOR_ANY_USE:
+                    excluded_hit = category_name
+                    break
+            if excluded_hit is not None:
+                print(f"'{random_title}' is in an excluded category ({excluded_hit}). Skipping.")
                 continue
 
+            page_categories = {cat['title'][9:] for cat in raw_categories}
+
             encoded_title = urllib.parse.quote(random_title.replace(' ', '_'))
             print("Found a new, valid random article URL:", f"https://starwars.fandom.com/wiki/{encoded_title}")
             
-            return random_title, page_categories
+            return random_title, page_categories, page
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}. Skipping attempt.")
             continue
-    return None, set() # Return None and an empty set if no title is found
+    return None, set(), None # Return None and an empty set if no title is found
 
 # 5. Function to get all page data, including images and structured content
-def get_article_content(title):
-    """Gets all page data and returns it in a structured dictionary."""
-    url = "https://starwars.fandom.com/api.php"
-    params = {"action": "query", "format": "json", "prop": "images", "titles": title}
-    res = requests.get(url, params=params).json()
-    page = next(iter(res["query"]["pages"].values()))
-    
+def get_article_content(title, page=None):
+    """Gets all page data and returns it in a structured dictionary.
+
+    If the page dict from get_random_title is passed in, its image list is
+    reused instead of re-querying the API for the same title."""
+    if page is None:
+        url = "https://starwars.fandom.com/api.php"
+        params = {"action": "query", "format": "json", "prop": "images", "titles": title, "imlimit": "max"}
+        res = SESSION.get(url, params=params, timeout=10).json()
+        page = next(iter(res["query"]["pages"].values()))
+
     parsed_data = get_summary_from_html(title)
-    
+
     return {
         "title": title,
         "parsed_data": parsed_data,
@@ -147,33 +223,78 @@ def get_article_content(title):
 
 # 6. Function to filter out images based on specific keywords
 # Todo: This functon doesnt work always properly, it should be improved
+# One compiled alternation scans each title in a single C-level pass instead
+# of ~20 Python-level substring checks per image
+_IMG_EXCLUDE_RE = re.compile('|'.join(re.escape(keyword) for keyword in [
+    "logo", "banner", "icon", "question", "cite", "premium", "gotocanon",
+    "gotolegends", "swcustom", "tab-", "onacanonarticle", "onalegendsarticle",
+    "blue-exclamation-mark", "starwars-databank", "food-stub", "bobawhere", "char-stub",
+    "falactic_senate", "swtor_mini", "onanoncanonarticle", "swajsmall", "wizardsofthecoast",
+    "wiki-shrinkable", "lego", "military-stub", "kdy", "swinsider",
+    "stub", "planet-stub"
+]))
+
 def filter_images(image_titles):
-    exclude_keywords = [
-        "logo", "banner", "icon", "question", "cite", "premium", "gotocanon", 
-        "gotolegends", "swcustom", "tab-", "onacanonarticle", "onalegendsarticle", 
-        "blue-exclamation-mark", "starwars-databank", "food-stub", "bobawhere", "char-stub",
-        "falactic_senate", "swtor_mini", "onanoncanonarticle", "swajsmall", "wizardsofthecoast",
-        "wiki-shrinkable", "lego", "military-stub", "SWTOR_mini", "kdy", "swinsider", "SWInsider",
-        "stub", "planet-stub", "Planet-stub"
-    ]
-    filtered = []
-    for image in image_titles:
-        title = image['title'].lower()
-        if not any(keyword in title for keyword in exclude_keywords):
-            filtered.append(image)
-    return filtered
+    return [image for image in image_titles
+            if not _IMG_EXCLUDE_RE.search(image['title'].lower())]
+
+# The MediaWiki API accepts up to 50 titles per 'titles=' parameter
+MEDIAWIKI_TITLES_PER_REQUEST = 50
+
+# On-disk image title -> URL map. The same logos and common character images
+# appear across many articles, so after a few runs most lookups never hit the
+# API at all.
+IMAGE_URL_CACHE_FILE = "../data/image_url_cache.db"
+_image_url_cache = None
+
+def _get_image_url_cache():
+    """Opens the persistent image URL cache on first use, closed via atexit."""
+    global _image_url_cache
+    if _image_url_cache is None:
+        os.makedirs(os.path.dirname(IMAGE_URL_CACHE_FILE), exist_ok=True)
+        _image_url_cache = shelve.open(IMAGE_URL_CACHE_FILE)
+        atexit.register(_image_url_cache.close)
+    return _image_url_cache
 
 # 7. Function to get image URLs from the filtered image titles
 def get_image_urls(image_titles):
+    """Fetches image info in batches of up to 50 titles per request (the
+    MediaWiki maximum), so a whole article's images resolve in one or two calls
+    instead of one round trip per image. Batches are fetched concurrently, and
+    resolved URLs are memoized on disk so repeated assets cost no API call."""
+    url = "https://starwars.fandom.com/api.php"
+    cache = _get_image_url_cache()
+
     urls = []
+    missing_titles = []
     for image in image_titles:
-        title = image['title']
-        url = "https://starwars.fandom.com/api.php"
-        params = {"action": "query", "format": "json", "titles": title, "prop": "imageinfo", "iiprop": "url"}
-        res = requests.get(url, params=params).json()
-        page = next(iter(res['query']['pages'].values()))
-        if 'imageinfo' in page:
-            urls.append(page['imageinfo'][0]['url'])
+        cached_url = cache.get(image['title'])
+        if cached_url is not None:
+            urls.append(cached_url)
+        else:
+            missing_titles.append(image['title'])
+
+    def fetch_image_url_batch(title_batch):
+        params = {"action": "query", "format": "json", "titles": "|".join(title_batch),
+                  "prop": "imageinfo", "iiprop": "url"}
+        pairs = []
+        try:
+            res = SESSION.get(url, params=params, timeout=10).json()
+            for page in res.get('query', {}).get('pages', {}).values():
+                if 'imageinfo' in page:
+                    pairs.append((page['title'], page['imageinfo'][0]['url']))
+        except requests.exceptions.RequestException as e:
+            print(f"Image info request failed for a batch of {len(title_batch)} titles: {e}. Skipping batch.")
+        return pairs
+
+    title_batches = [missing_titles[i:i + MEDIAWIKI_TITLES_PER_REQUEST]
+                     for i in range(0, len(missing_titles), MEDIAWIKI_TITLES_PER_REQUEST)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for batch_pairs in executor.map(fetch_image_url_batch, title_batches):
+            # Cache writes stay on the calling thread; shelve is not thread-safe
+            for image_title, image_url in batch_pairs:
+                cache[image_title] = image_url
+                urls.append(image_url)
     return urls
 
 # 8. Function to scrape a Wookieepedia page and return structured content
@@ -184,63 +305,93 @@ def get_summary_from_html(title):
     url = f"https://starwars.fandom.com/wiki/{urllib.parse.quote(title.replace(' ', '_'))}"
     
     try:
-        res = requests.get(url)
+        res = SESSION.get(url, timeout=10)
         res.raise_for_status()
-        soup = bs4.BeautifulSoup(res.text, 'html.parser')
-        
-        # --- Data Extraction into Intermediate Structures ---
+        # Parse with lxml directly and extract via XPath: the selection and the
+        # reference-sup filtering run as C-level tree walks instead of
+        # BeautifulSoup's per-node Python traversal
+        tree = lxml.html.fromstring(res.text)
+
+        # --- Data Extraction: single fused walk over the document ---
+        # One iterwalk pass populates both the infobox data and the content
+        # sections instead of two separate descents over the node arena. The
+        # infobox subtree is harvested when its aside is first entered and then
+        # pruned with skip_subtree(), which also keeps its text out of the
+        # content sections without mutating the tree.
         infobox_data = defaultdict(list)
-        infobox = soup.find('aside', class_='portable-infobox')
-        if infobox:
-            current_section = infobox.find('h2', class_='pi-title').get_text(strip=True) if infobox.find('h2', 'pi-title') else "General"
-            for item in infobox.find_all(['h2', 'div'], class_=['pi-header', 'pi-data']):
-                if 'pi-header' in item.get('class', []):
-                    current_section = item.get_text(strip=True)
-                elif 'pi-data' in item.get('class', []):
-                    label_el = item.find('h3', class_='pi-data-label')
-                    value_el = item.find('div', class_='pi-data-value')
-                    if label_el and value_el:
-                        for sup in value_el.find_all('sup', class_='reference'): sup.decompose()
-                        key = label_el.get_text(strip=True)
-                        value = ' '.join(value_el.get_text(separator=' ', strip=True).split())
-                        infobox_data[current_section].append(f"{key}: {value}")
-            infobox.decompose()
-
-        # --- Content Section Parsing ---
         content_sections = defaultdict(list)
         appearances = []
         current_section_key = 'Main' # For text before the first header
-        content_div = soup.find('div', class_='mw-parser-output')
-        if content_div:
-            parsing_appearances = False
-            for element in content_div.find_all(['h2', 'h3', 'p', 'div', 'ul'], recursive=False):
-                if element.name in ['h2', 'h3']:
-                    headline_span = element.find('span', class_='mw-headline')
-                    if not headline_span: continue
-                    headline_text = headline_span.get_text(strip=True)
-                    stop_keywords = ["Sources", "Notes and references", "See also", "External links"]
-                    if any(keyword in headline_text for keyword in stop_keywords): break
-                    parsing_appearances = "Appearances" in headline_text
-                    if not parsing_appearances:
-                        current_section_key = headline_text
-                elif parsing_appearances and element.name in ['div', 'ul']:
-                    for li in element.find_all('li'):
-                        raw_text = li.get_text(strip=True)
-                        cleaned_text = re.sub(r'\s*\([^)]*\)', '', raw_text).strip()
-                        if cleaned_text: appearances.append(cleaned_text)
-                elif not parsing_appearances and element.name == 'p':
-                    for sup in element.find_all('sup', class_='reference'): sup.decompose()
-                    text = element.get_text(separator=' ', strip=True)
-                    if text: content_sections[current_section_key].append(text)
+        parsing_appearances = False
+        stop_keywords = ("Sources", "Notes and references", "See also", "External links")
+        content_root = None
+
+        walker = lxml.etree.iterwalk(tree, events=('start',),
+                                     tag=('aside', 'div', 'h2', 'h3', 'p', 'ul'))
+        for event, element in walker:
+            classes = element.get('class') or ''
+
+            if element.tag == 'aside' and 'portable-infobox' in classes:
+                pi_title = element.xpath('.//h2[contains(@class,"pi-title")]')
+                current_infobox_section = pi_title[0].text_content().strip() if pi_title else "General"
+                for item in element.xpath('.//*[self::h2[contains(@class,"pi-header")] '
+                                          'or self::div[contains(@class,"pi-data")]]'):
+                    if 'pi-header' in (item.get('class') or ''):
+                        current_infobox_section = item.text_content().strip()
+                    else:
+                        label_parts = item.xpath('.//h3[contains(@class,"pi-data-label")]//text()')
+                        # The ancestor predicate drops reference sups without mutating the tree
+                        value_parts = item.xpath('.//div[contains(@class,"pi-data-value")]'
+                                                 '//text()[not(ancestor::sup[contains(@class,"reference")])]')
+                        if label_parts and value_parts:
+                            key = ''.join(label_parts).strip()
+                            value = ' '.join(''.join(value_parts).split())
+                            infobox_data[current_infobox_section].append(f"{key}: {value}")
+                walker.skip_subtree()
+                continue
+
+            if content_root is None:
+                if element.tag == 'div' and 'mw-parser-output' in classes:
+                    content_root = element
+                continue
+
+            # Only direct children of the content div carry section structure
+            if element.getparent() is not content_root:
+                continue
+
+            if element.tag in ('h2', 'h3'):
+                headline_spans = element.xpath('.//span[contains(@class,"mw-headline")]')
+                if not headline_spans: continue
+                headline_text = headline_spans[0].text_content().strip()
+                if any(keyword in headline_text for keyword in stop_keywords): break
+                parsing_appearances = "Appearances" in headline_text
+                if not parsing_appearances:
+                    current_section_key = headline_text
+            elif parsing_appearances and element.tag in ('div', 'ul'):
+                for li in element.xpath('.//li'):
+                    raw_text = li.text_content().strip()
+                    cleaned_text = _PAREN_RE.sub('', raw_text).strip()
+                    if cleaned_text: appearances.append(cleaned_text)
+                walker.skip_subtree()
+            elif not parsing_appearances and element.tag == 'p':
+                text_parts = element.xpath('.//text()[not(ancestor::sup[contains(@class,"reference")])]')
+                text = ' '.join(''.join(text_parts).split())
+                if text: content_sections[current_section_key].append(text)
+                walker.skip_subtree()
 
         # --- Final Formatting into Token-Efficient Strings ---
         final_sections = {key: " ".join(value) for key, value in content_sections.items()}
         
-        infobox_string_parts = []
+        # One StringIO writer instead of a list-of-strings intermediate plus a
+        # second join: each section lands in the growable buffer exactly once
+        infobox_writer = io.StringIO()
         for section, kv_pairs in infobox_data.items():
-            pairs_str = "; ".join(kv_pairs)
-            infobox_string_parts.append(f"{section} | {pairs_str}")
-        infobox_final_str = " | ".join(infobox_string_parts)
+            if infobox_writer.tell():
+                infobox_writer.write(" | ")
+            infobox_writer.write(section)
+            infobox_writer.write(" | ")
+            infobox_writer.write("; ".join(kv_pairs))
+        infobox_final_str = infobox_writer.getvalue()
         
         return {
             "infobox_string": infobox_final_str,
@@ -258,10 +409,10 @@ if __name__ == "__main__":
     os.makedirs(BASE_ARTICLE_DIRECTORY, exist_ok=True)
     
     # Always try to get a random title
-    title, categories = get_random_title(TRACKING_ARTICLE_FILE)
-    
+    title, categories, page = get_random_title(TRACKING_ARTICLE_FILE)
+
     if title:
-        page_data = get_article_content(title)
+        page_data = get_article_content(title, page)
         
         if "Error" in page_data["parsed_data"]["content_sections"]:
             print(f"Could not process '{title}'. Reason: {page_data['parsed_data']['content_sections']['Error']}")
@@ -271,17 +422,13 @@ if __name__ == "__main__":
             
             chosen_category_for_folder = "Uncategorized" # Default fallback
 
-            # Combine all exclusion sets for checking against potential folder names
-            all_avoid_categories_for_folder_name = AVOID_FOLDER_CATEGORIES.union(EXCLUDE_CATEGORIES_FOR_ANY_USE)
-            
             # Convert categories set to a sorted list to ensure deterministic "first" tag
             sorted_page_categories = sorted(list(categories))
-            
+
             # Iterate through the page's categories and pick the first suitable one for the folder name
             for cat in sorted_page_categories:
                 # Check if the category is suitable (not in any exclusion/avoid list, and not a generic keyword)
-                if cat not in all_avoid_categories_for_folder_name and \
-                   not any(keyword in cat.lower() for keyword in ["real-world", "disambiguation", "date", "fictional"]):
+                if cat not in _ALL_AVOID_FOLDER_CATEGORIES and not _GENERIC_CATEGORY_RE.search(cat):
                     chosen_category_for_folder = cat
                     break # Use this category and stop searching
 
@@ -1,8 +1,17 @@
 ### TRANSCRIPT GENERATION USING FORCE ALIGNMENT (WITH DEBUGGING) ###
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from forcealign import ForceAlign
 import re # For sanitizing filenames
 
+# The per-word alignment output is opt-in debug logging: printing several lines
+# per aligned word costs thousands of stdout flushes per transcript. Set
+# LOG_LEVEL=DEBUG to re-enable it.
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"),
+                    format='%(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
 # Directory where AI generated audio files are stored
 GENERATED_AUDIO_DIRECTORY = "../data/generated_audio"
 
@@ -20,11 +29,13 @@ TEXT_FILE_SUFFIX = "_rephrased.txt"
 
 def format_time_for_srt(seconds):
     """Converts seconds to SRT time format: HH:MM:SS,mmm"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds_remainder = seconds % 60
-    milliseconds = int((seconds_remainder - int(seconds_remainder)) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{int(seconds_remainder):02d},{milliseconds:03d}"
+    # One float-to-int conversion up front, then pure integer divmods: avoids
+    # repeated floating-point modulo and its rounding surprises near 59.9995
+    milliseconds = int(round(seconds * 1000))
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
 def create_srt_from_alignment(words_with_timestamps, output_filepath):
     """
@@ -41,16 +52,16 @@ def create_srt_from_alignment(words_with_timestamps, output_filepath):
     WORD_GROUP_LIMIT = 5 # Max words per line
     PAUSE_THRESHOLD = 0.3 # seconds, for detecting a natural break
 
-    print(f"\n--- Debugging SRT Creation for {os.path.basename(output_filepath)} ---")
-    print(f"Total words from alignment: {len(words_with_timestamps)}")
+    logger.debug("--- Debugging SRT Creation for %s ---", os.path.basename(output_filepath))
+    logger.debug("Total words from alignment: %d", len(words_with_timestamps))
 
     for i, word_info in enumerate(words_with_timestamps):
         word = word_info.word
         start_time = word_info.time_start
         end_time = word_info.time_end
 
-        # Debug print for each word's timestamp
-        print(f"  Word {i+1}: '{word}' (Start: {start_time:.3f}, End: {end_time:.3f})")
+        # Debug log for each word's timestamp
+        logger.debug("  Word %d: '%s' (Start: %.3f, End: %.3f)", i + 1, word, start_time, end_time)
 
         if not current_line_words:
             current_line_start_time = start_time
@@ -63,16 +74,17 @@ def create_srt_from_alignment(words_with_timestamps, output_filepath):
         should_break = False
         if is_last_word:
             should_break = True
-            print("    Break reason: Last word.")
+            logger.debug("    Break reason: Last word.")
         elif len(current_line_words) >= WORD_GROUP_LIMIT:
             should_break = True
-            print(f"    Break reason: Word group limit ({WORD_GROUP_LIMIT}) reached.")
+            logger.debug("    Break reason: Word group limit (%d) reached.", WORD_GROUP_LIMIT)
         elif next_word_info and (next_word_info.time_start - end_time > PAUSE_THRESHOLD):
             should_break = True
-            print(f"    Break reason: Pause detected ({(next_word_info.time_start - end_time):.3f}s > {PAUSE_THRESHOLD}s).")
+            logger.debug("    Break reason: Pause detected (%.3fs > %ss).",
+                         next_word_info.time_start - end_time, PAUSE_THRESHOLD)
         elif re.search(r'[.!?]', word): # Check for punctuation
             should_break = True
-            print("    Break reason: Punctuation detected.")
+            logger.debug("    Break reason: Punctuation detected.")
 
         if should_break:
             line_text = " ".join(current_line_words)
@@ -83,9 +95,12 @@ def create_srt_from_alignment(words_with_timestamps, output_filepath):
             srt_entries.append(line_text)
             srt_entries.append("") # Blank line separator for SRT
 
-            print(f"  --- SRT Entry {sequence_number} ---")
-            print(f"    Time: {format_time_for_srt(current_line_start_time)} --> {format_time_for_srt(line_end_time)}")
-            print(f"    Text: \"{line_text}\"")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  --- SRT Entry %d ---", sequence_number)
+                logger.debug("    Time: %s --> %s",
+                             format_time_for_srt(current_line_start_time),
+                             format_time_for_srt(line_end_time))
+                logger.debug('    Text: "%s"', line_text)
             
             current_line_words = []
             current_line_start_time = None
@@ -94,8 +109,9 @@ def create_srt_from_alignment(words_with_timestamps, output_filepath):
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
     
-    with open(output_filepath, "w", encoding="utf-8") as f:
-        f.write("\n".join(srt_entries))
+    # Large buffer so the whole SRT leaves in one write even on network filesystems
+    with open(output_filepath, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(entry + "\n" for entry in srt_entries)
     print(f"\nGenerated SRT: {output_filepath}")
 
 
@@ -111,50 +127,95 @@ def add_to_processed_log(identifier):
     with open(TRACKING_TRANSCRIPT_FILE, "a", encoding="utf-8") as f:
         f.write(f"{identifier}\n")
 
+def _load_model_in_worker():
+    """Runs once per worker process: loads the wav2vec2 acoustic model and
+    caches it behind the pipeline bundle, so every ForceAlign instance the
+    worker creates reuses the loaded model instead of paying the load per file."""
+    try:
+        import torchaudio
+        bundle = torchaudio.pipelines.WAV2VEC2_ASR_BASE_960H
+        model = bundle.get_model()
+        bundle.get_model = lambda *args, **kwargs: model
+    except Exception as e:
+        # Fall back to per-file model loading rather than killing the worker
+        print(f"Could not pre-load alignment model in worker: {e}")
+
+def _align_one(task):
+    """Force-aligns one (audio, text) pair and writes its SRT file.
+
+    Runs inside a worker process. Returns the file identifier and whether the
+    pair should be marked as processed."""
+    audio_file_path, text_file_path, output_srt_path, file_identifier = task
+
+    print(f"\nProcessing: Audio='{audio_file_path}', Text='{text_file_path}'")
+
+    try:
+        with open(text_file_path, "r", encoding="utf-8") as f:
+            transcript = f.read().strip()
+
+        if not transcript:
+            print(f"Skipping empty transcript: {text_file_path}")
+            return file_identifier, True
+
+        aligner = ForceAlign(audio_file=audio_file_path, transcript=transcript)
+        words = aligner.inference()
+
+        create_srt_from_alignment(words, output_srt_path)
+        return file_identifier, True
+
+    except Exception as e:
+        print(f"Error processing {file_identifier}: {e}")
+        return file_identifier, False
+
+AUDIO_SUFFIXES = (".mp3", ".wav")
+
+def _iter_audio_files(directory):
+    """Yields every audio file path under directory. scandir reuses the type
+    information from the directory listing, so no extra stat per entry."""
+    for entry in os.scandir(directory):
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_audio_files(entry.path)
+        elif entry.name.endswith(AUDIO_SUFFIXES):
+            yield entry.path
+
 def process_audio_text_pairs():
     processed_files = get_processed_log()
 
-    for root, _, files in os.walk(GENERATED_AUDIO_DIRECTORY):
-        for audio_file_name in files:
-            if audio_file_name.endswith((".mp3", ".wav")):
-                relative_path = os.path.relpath(root, GENERATED_AUDIO_DIRECTORY)
-                base_name = os.path.splitext(audio_file_name)[0]
-                audio_file_path = os.path.join(root, audio_file_name)
-                text_file_path = os.path.join(GENERATED_TEXT_DIRECTORY, relative_path, f"{base_name}{TEXT_FILE_SUFFIX}")
-                file_identifier = os.path.relpath(audio_file_path, GENERATED_AUDIO_DIRECTORY)
-
-                if file_identifier in processed_files:
-                    print(f"Skipping already processed: {file_identifier}")
-                    continue
-                
-                if not os.path.exists(text_file_path):
-                    print(f"Warning: Corresponding text file not found for audio '{audio_file_path}'. Expected '{text_file_path}'")
-                    continue
-                
-                print(f"\nProcessing: Audio='{audio_file_path}', Text='{text_file_path}'")
-
-                try:
-                    with open(text_file_path, "r", encoding="utf-8") as f:
-                        transcript = f.read().strip()
-
-                    if not transcript:
-                        print(f"Skipping empty transcript: {text_file_path}")
-                        add_to_processed_log(file_identifier)
-                        continue
-                    
-                    aligner = ForceAlign(audio_file=audio_file_path, transcript=transcript)
-                    words = aligner.inference()
-
-                    output_srt_directory = os.path.join(GENERATED_TRANSCRIPT_DIRECTORY, relative_path)
-                    os.makedirs(output_srt_directory, exist_ok=True)
-                    srt_file_name = f"{base_name}.srt"
-                    output_srt_path = os.path.join(output_srt_directory, srt_file_name)
-
-                    create_srt_from_alignment(words, output_srt_path)
-                    add_to_processed_log(file_identifier)
-
-                except Exception as e:
-                    print(f"Error processing {file_identifier}: {e}")
+    # First collect every pending (audio, text) pair, then fan the alignment
+    # work out over a process pool: ForceAlign is compute-bound and each pair
+    # is independent, so this scales with the available cores.
+    tasks = []
+    for audio_file_path in _iter_audio_files(GENERATED_AUDIO_DIRECTORY):
+        relative_path = os.path.relpath(os.path.dirname(audio_file_path), GENERATED_AUDIO_DIRECTORY)
+        base_name = os.path.splitext(os.path.basename(audio_file_path))[0]
+        text_file_path = os.path.join(GENERATED_TEXT_DIRECTORY, relative_path, f"{base_name}{TEXT_FILE_SUFFIX}")
+        file_identifier = os.path.relpath(audio_file_path, GENERATED_AUDIO_DIRECTORY)
+
+        if file_identifier in processed_files:
+            print(f"Skipping already processed: {file_identifier}")
+            continue
+
+        if not os.path.exists(text_file_path):
+            print(f"Warning: Corresponding text file not found for audio '{audio_file_path}'. Expected '{text_file_path}'")
+            continue
+
+        output_srt_directory = os.path.join(GENERATED_TRANSCRIPT_DIRECTORY, relative_path)
+        os.makedirs(output_srt_directory, exist_ok=True)
+        output_srt_path = os.path.join(output_srt_directory, f"{base_name}.srt")
+        tasks.append((audio_file_path, text_file_path, output_srt_path, file_identifier))
+
+    if not tasks:
+        return
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                             initializer=_load_model_in_worker) as executor:
+        futures = [executor.submit(_align_one, task) for task in tasks]
+        # The tracking log is only written here on the main process, so the
+        # workers never contend for the append handle
+        for future in as_completed(futures):
+            file_identifier, processed = future.result()
+            if processed:
+                add_to_processed_log(file_identifier)
 
 if __name__ == "__main__":
     os.makedirs(GENERATED_AUDIO_DIRECTORY, exist_ok=True)
@@ -1,14 +1,26 @@
 ### VIDEO GENERATION SCRIPT WITH TRANSCRIPT (WITH DEBUGGING) ###
+import functools
+import json
+import multiprocessing
 import os
 import re
 import random
 import requests
-from moviepy.editor import VideoFileClip, AudioFileClip, ImageClip, CompositeVideoClip
+import shutil
+import subprocess
+from moviepy.editor import VideoFileClip, AudioFileClip
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
-import glob
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 
+# Shared keep-alive session for image downloads: the overlay images all come
+# from the same wiki image host, so reusing the TCP+TLS connection avoids a
+# handshake per image
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 # --- Configuration ---
 
 # Main Minecraft parkour footage path
@@ -36,6 +48,169 @@ TRACKING_SHORTS_FILE = "../data/generated_shorts.log"
 TARGET_WIDTH = 1080
 TARGET_HEIGHT = 1920 # For 9:16 aspect ratio
 
+# Shorts rendered concurrently, and the x264 threads each encode gets. The
+# encoder is internally multithreaded, so a quarter of the cores worth of
+# workers keeps the encodes from oversubscribing each other.
+SHORT_POOL_WORKERS = max(1, (os.cpu_count() or 1) // 4)
+ENCODER_THREADS = max(1, (os.cpu_count() or 1) // SHORT_POOL_WORKERS)
+
+# Output frame rate, and how many frames are composited per batch before being
+# handed to the encoder
+OUTPUT_FPS = 30
+FRAME_BATCH = 16
+
+# Per-frame compositing prints are opt-in: formatting and flushing several
+# lines per second of video costs real time in the hot loop. Set
+# VIDEOGEN_DEBUG=1 to re-enable them.
+DEBUG = os.environ.get('VIDEOGEN_DEBUG') == '1'
+
+# Numba is optional: when it is installed the blend runs as a compiled,
+# row-parallel kernel that writes each pixel in place with no temporary
+# arrays; otherwise the vectorized NumPy path below is used unchanged.
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _blend_rows(region, overlay_rgb, overlay_alpha):
+        for y in prange(region.shape[0]):
+            for x in range(region.shape[1]):
+                a = overlay_alpha[y, x, 0]
+                inv = 255 - a
+                for c in range(3):
+                    region[y, x, c] = (region[y, x, c] * inv
+                                       + overlay_rgb[y, x, c] * a + 127) // 255
+
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+# Blend lookup tables: row a of each table holds the destination/source
+# contribution (v*(255-a)+127)//255 resp. (v*a+127)//255 for every channel
+# value v, so the NumPy blend path is two gathers and an add with no per-pixel
+# multiply or divide. The two contributions sum to at most 255 by
+# construction, so the uint8 addition cannot wrap.
+_LUT_VALUES = np.arange(256, dtype=np.uint32)
+_BLEND_LUT_DST = ((_LUT_VALUES[None, :] * (255 - _LUT_VALUES)[:, None] + 127) // 255).astype(np.uint8)
+_BLEND_LUT_SRC = ((_LUT_VALUES[None, :] * _LUT_VALUES[:, None] + 127) // 255).astype(np.uint8)
+
+def _blend_overlay(region, overlay_rgb, overlay_alpha):
+    """Alpha-blends a cached overlay into region in place with integer math.
+
+    overlay_alpha holds values in 0..255 with shape (h, w, 1), broadcast over
+    the colour channels of region and overlay_rgb."""
+    if _HAVE_NUMBA:
+        if region.ndim == 4:
+            for frame_region in region:
+                _blend_rows(frame_region, overlay_rgb, overlay_alpha)
+        else:
+            _blend_rows(region, overlay_rgb, overlay_alpha)
+        return
+    region[:] = (_BLEND_LUT_DST[overlay_alpha, region]
+                 + _BLEND_LUT_SRC[overlay_alpha, overlay_rgb])
+
+@functools.lru_cache(maxsize=8)
+def _probe_video_metadata(video_path):
+    """Returns (width, height, duration) for a video file via one ffprobe call.
+
+    Opening a VideoFileClip just to read its size and duration spins up a full
+    MoviePy ffmpeg reader for the whole file; ffprobe answers the same question
+    from the container header in milliseconds, and the lru_cache means each
+    footage file is probed once per process."""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "stream=width,height,duration",
+         "-show_entries", "format=duration",
+         "-of", "json", video_path],
+        capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout)
+    stream = probe["streams"][0]
+    duration = float(stream.get("duration") or probe["format"]["duration"])
+    return int(stream["width"]), int(stream["height"]), duration
+
+def _ensure_preprocessed_footage(footage_path, target_width=TARGET_WIDTH, target_height=TARGET_HEIGHT):
+    """Returns a copy of the footage already cropped and scaled to the target
+    resolution, transcoding it once if it does not exist yet.
+
+    Every short drew from the same source file, so each one used to pay the
+    crop+scale of full-resolution frames during its own segment extraction.
+    Preparing the footage once means per-short extraction decodes frames that
+    are already at 1080x1920. Falls back to the original footage on failure."""
+    base, ext = os.path.splitext(footage_path)
+    preprocessed_path = f"{base}_{target_width}x{target_height}{ext}"
+    try:
+        if (os.path.exists(preprocessed_path)
+                and os.path.getmtime(preprocessed_path) >= os.path.getmtime(footage_path)):
+            return preprocessed_path
+
+        original_width, original_height, _ = _probe_video_metadata(footage_path)
+
+        target_aspect_ratio = target_width / target_height
+        if original_width / original_height > target_aspect_ratio:
+            crop_width = int(original_height * target_aspect_ratio)
+            crop_height = original_height
+            crop_x = int(original_width / 2 - crop_width / 2)
+            crop_y = 0
+        else:
+            crop_width = original_width
+            crop_height = int(original_width / target_aspect_ratio)
+            crop_x = 0
+            crop_y = int(original_height / 2 - crop_height / 2)
+
+        print(f"Preprocessing footage once to {target_width}x{target_height}: {preprocessed_path}")
+        subprocess.run(
+            ["ffmpeg", "-y", "-i", footage_path,
+             "-vf", (f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y},"
+                     f"scale={target_width}:{target_height}"),
+             "-an", "-c:v", "libx264", "-preset", "veryfast", "-crf", "18",
+             preprocessed_path],
+            check=True, capture_output=True
+        )
+        return preprocessed_path
+    except Exception as e:
+        print(f"Could not preprocess footage {footage_path}: {e}")
+        return footage_path
+
+@functools.lru_cache(maxsize=1)
+def _pick_video_codec():
+    """Returns the (encoder, preset) pair to use, probing ffmpeg once per process.
+
+    NVENC offloads the encode to the GPU and is typically several times faster
+    than libx264, but stock ffmpeg builds list h264_nvenc even on machines
+    without a working NVIDIA driver, and it only understands its own preset
+    names (p1-p7, not the x264 ones), so it is only chosen after a one-frame
+    trial encode proves it can actually initialize."""
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, check=True)
+        if "h264_nvenc" in result.stdout:
+            trial = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-f", "lavfi",
+                 "-i", "color=black:size=64x64:rate=30:duration=0.1",
+                 "-frames:v", "1", "-c:v", "h264_nvenc", "-preset", "p4",
+                 "-f", "null", "-"],
+                capture_output=True)
+            if trial.returncode == 0:
+                print("Using hardware encoder: h264_nvenc")
+                return "h264_nvenc", "p4"
+            print("h264_nvenc is listed but failed a trial encode, using libx264 instead.")
+    except Exception as e:
+        print(f"Could not probe ffmpeg encoders: {e}")
+    return "libx264", "veryfast"
+
+# Font used for both the title and the subtitles
+FONT_PATH = "../data/fonts/sf-distant-galaxy-font/SfDistantGalaxy-0l3d.ttf"
+
+@functools.lru_cache(maxsize=8)
+def _load_font(size):
+    """Loads (and caches) the overlay font at a given size, so font parsing
+    happens once per process instead of once per use."""
+    try:
+        return ImageFont.truetype(FONT_PATH, size)
+    except IOError:
+        print(f"Warning: Could not load font '{FONT_PATH}'. Falling back to default.")
+        return ImageFont.load_default()
+
 # --- Helper Functions for Tracking ---
 
 # 1. Function to get previously processed shorts titles
@@ -69,10 +244,11 @@ def extract_image_urls_from_article(article_content):
 
 # 2. Function to download an image from a URL
 def download_image(url, destination_folder):
-    """Downloads an image from a URL to a specified folder and returns its local path."""
-    os.makedirs(destination_folder, exist_ok=True)
+    """Downloads an image from a URL to a specified folder and returns its
+    local path. The caller is responsible for creating the folder, so the
+    thread pool does not issue a redundant makedirs syscall per image."""
     try:
-        response = requests.get(url, stream=True)
+        response = SESSION.get(url, stream=True)
         response.raise_for_status()
 
         parsed_url = urlparse(url)
@@ -87,9 +263,12 @@ def download_image(url, destination_folder):
 
         local_filepath = os.path.join(destination_folder, f"{base}_{random.randint(1000,9999)}{ext}")
 
+        # Copy the body in 1 MB C-level chunks instead of an 8 KB Python loop;
+        # decode_content keeps gzip/deflate transparently handled like
+        # iter_content did
+        response.raw.decode_content = True
         with open(local_filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            shutil.copyfileobj(response.raw, f, length=1024 * 1024)
         print(f"Downloaded image from {url} to {local_filepath}")
         return local_filepath
     except requests.exceptions.RequestException as e:
@@ -114,75 +293,42 @@ def clean_temp_images(directory):
 
 # --- Subtitle Handling Functions ---
 
+# Matches one whole SRT block: index, the two timestamps, then the text up to
+# the next blank line. Compiled once, applied to the entire file in one pass.
+_SRT_BLOCK_RE = re.compile(
+    r'(\d+)\s*\n'
+    r'(\d+):(\d\d):(\d\d)[,.](\d+)\s*-->\s*(\d+):(\d\d):(\d\d)[,.](\d+)[^\n]*\n'
+    r'(.*?)(?=\n\s*\n|\Z)',
+    re.S)
+
 def parse_srt(srt_filepath):
-    """Parses an SRT file and returns a list of dictionaries, each containing
-    'start', 'end', and 'text' for a subtitle entry."""
-    
-    subtitles = []
-    current_block = []
-    
+    """Parses an SRT file into a struct-of-arrays dict: contiguous 'starts'
+    and 'ends' float arrays ready for searchsorted lookups plus a parallel
+    'texts' list, instead of scattering the cue data over per-entry dicts."""
+
+    empty = {'starts': np.empty(0, dtype=np.float64),
+             'ends': np.empty(0, dtype=np.float64),
+             'texts': []}
+
     if not os.path.exists(srt_filepath):
         print(f"SRT file not found: {srt_filepath}")
-        return subtitles
+        return empty
 
     with open(srt_filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line: # Empty line indicates end of a subtitle block
-                if current_block:
-                    try:
-                        sequence_number = int(current_block[0])
-                        time_str = current_block[1]
-                        start_time_str, end_time_str = time_str.split(' --> ')
-                        
-                        def srt_time_to_seconds(time_str_val):
-                            parts = time_str_val.replace(',', '.').split(':')
-                            if len(parts) == 3:
-                                h, m, s = float(parts[0]), float(parts[1]), float(parts[2])
-                                return h * 3600 + m * 60 + s
-                            return 0
-
-                        start_seconds = srt_time_to_seconds(start_time_str)
-                        end_seconds = srt_time_to_seconds(end_time_str)
-                        text = " ".join(current_block[2:])
-                        
-                        subtitles.append({
-                            'start': start_seconds,
-                            'end': end_seconds,
-                            'text': text
-                        })
-                    except (ValueError, IndexError) as e:
-                        print(f"Warning: Could not parse SRT block: {current_block}. Error: {e}")
-                    current_block = []
-            else:
-                current_block.append(line)
-        
-        if current_block:
-            try:
-                sequence_number = int(current_block[0])
-                time_str = current_block[1]
-                start_time_str, end_time_str = time_str.split(' --> ')
-                
-                def srt_time_to_seconds(time_str_val):
-                    parts = time_str_val.replace(',', '.').split(':')
-                    if len(parts) == 3:
-                        h, m, s = float(parts[0]), float(parts[1]), float(parts[2])
-                        return h * 3600 + m * 60 + s
-                    return 0
-
-                start_seconds = srt_time_to_seconds(start_time_str)
-                end_seconds = srt_time_to_seconds(end_time_str)
-                text = " ".join(current_block[2:])
-                
-                subtitles.append({
-                    'start': start_seconds,
-                    'end': end_seconds,
-                    'text': text
-                })
-            except (ValueError, IndexError) as e:
-                print(f"Warning: Could not parse final SRT block: {current_block}. Error: {e}")
-    
-    return subtitles
+        blocks = _SRT_BLOCK_RE.findall(f.read())
+
+    if not blocks:
+        return empty
+
+    # All eight timestamp columns land in one int array, and the start/end
+    # seconds fall out of two vectorized expressions instead of splitting and
+    # float-parsing each timestamp in Python
+    times = np.array([block[1:9] for block in blocks], dtype=np.int32)
+    return {
+        'starts': times[:, 0] * 3600 + times[:, 1] * 60 + times[:, 2] + times[:, 3] / 1000.0,
+        'ends': times[:, 4] * 3600 + times[:, 5] * 60 + times[:, 6] + times[:, 7] / 1000.0,
+        'texts': [" ".join(block[9].split()) for block in blocks],
+    }
 
 # --- Video Processing Function ---
 
@@ -241,10 +387,14 @@ def create_youtube_short(
     Creates a YouTube Short by combining a random segment of Minecraft footage with AI audio,
     cropping it to 9:16 aspect ratio, and saving it. Includes title text, image overlay, and subtitles.
     """
-    clean_temp_images(TEMP_IMAGE_DIRECTORY)
+    # Each short works in its own temp subdirectory so parallel workers never
+    # clobber each other's downloads or base segments. The finally block below
+    # is the only cleanup point: the directory is always left empty on exit,
+    # so there is nothing to sweep on entry.
+    short_temp_dir = os.path.join(TEMP_IMAGE_DIRECTORY, f"short_{os.getpid()}")
 
     subtitles = parse_srt(srt_filepath)
-    print(f"Loaded {len(subtitles)} subtitle entries from: {srt_filepath}")
+    print(f"Loaded {len(subtitles['texts'])} subtitle entries from: {srt_filepath}")
 
     try:
         audio_clip = AudioFileClip(audio_filepath)
@@ -252,10 +402,11 @@ def create_youtube_short(
         
         print(f"Loaded audio: {os.path.basename(audio_filepath)} (Duration: {audio_duration:.2f}s)")
 
-        main_video_clip = VideoFileClip(minecraft_footage_path)
-        full_video_duration = main_video_clip.duration
-        
-        print(f"Loaded main video: {os.path.basename(minecraft_footage_path)} (Duration: {full_video_duration:.2f}s)")
+        # One ffprobe header read instead of a full MoviePy reader just for
+        # the footage duration and size
+        original_width, original_height, full_video_duration = _probe_video_metadata(minecraft_footage_path)
+
+        print(f"Probed main video: {os.path.basename(minecraft_footage_path)} (Duration: {full_video_duration:.2f}s)")
 
         max_start_time_based_on_80_percent = full_video_duration * 0.8
         max_possible_start_time_for_audio_fit = full_video_duration - audio_duration
@@ -264,7 +415,6 @@ def create_youtube_short(
 
         if actual_max_start_time < 0:
             print(f"Warning: Audio duration ({audio_duration:.2f}s) is longer than main video ({full_video_duration:.2f}s). Skipping {article_title}.")
-            main_video_clip.close()
             audio_clip.close()
             return False
             
@@ -283,213 +433,259 @@ def create_youtube_short(
                  
         print(f"Selected video segment: {random_start_time:.2f}s to {end_time:.2f}s (Clip duration: {(end_time - random_start_time):.2f}s)")
 
-        video_clip = main_video_clip.subclip(random_start_time, end_time)
-        video_clip = video_clip.set_audio(None)
-        video_clip = video_clip.set_audio(audio_clip)
-
-        original_width, original_height = video_clip.size
-        target_aspect_ratio = target_width / target_height 
+        # Trim, crop and scale natively in one ffmpeg filtergraph instead of
+        # routing every full-resolution frame through MoviePy's Python-side
+        # subclip/crop/resize chain. The compositing callback below then only
+        # ever sees frames already at the target resolution.
+        target_aspect_ratio = target_width / target_height
         original_aspect_ratio = original_width / original_height
 
         if original_aspect_ratio > target_aspect_ratio:
-            new_width = int(original_height * target_aspect_ratio)
-            x_center = original_width / 2
-            x1 = int(x_center - new_width / 2)
-            y1 = 0
-            cropped_clip = video_clip.crop(x1=x1, y1=y1, width=new_width, height=original_height)
-            print(f"Cropping width from {original_width} to {new_width} to fit 9:16.")
+            crop_width = int(original_height * target_aspect_ratio)
+            crop_height = original_height
+            crop_x = int(original_width / 2 - crop_width / 2)
+            crop_y = 0
+            print(f"Cropping width from {original_width} to {crop_width} to fit 9:16.")
         else:
-            new_height = int(original_width / target_aspect_ratio)
-            y_center = original_height / 2
-            y1 = int(y_center - new_height / 2)
-            x1 = 0
-            cropped_clip = video_clip.crop(x1=x1, y1=y1, width=original_width, height=new_height)
-            print(f"Cropping height from {original_height} to {new_height} to fit 9:16.")
+            crop_width = original_width
+            crop_height = int(original_width / target_aspect_ratio)
+            crop_x = 0
+            crop_y = int(original_height / 2 - crop_height / 2)
+            print(f"Cropping height from {original_height} to {crop_height} to fit 9:16.")
+
+        segment_path = os.path.join(short_temp_dir, "base_segment.mp4")
+        os.makedirs(short_temp_dir, exist_ok=True)
+        filtergraph = (f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y},"
+                       f"scale={target_width}:{target_height}")
+        # -ss before -i is a fast input seek: ffmpeg jumps straight to the
+        # nearest keyframe instead of decoding and discarding everything from
+        # frame 0 up to the random start point
+        subprocess.run(
+            ["ffmpeg", "-y", "-ss", f"{random_start_time:.3f}",
+             "-i", minecraft_footage_path,
+             "-t", f"{end_time - random_start_time:.3f}",
+             "-vf", filtergraph, "-an",
+             "-c:v", "libx264", "-preset", "veryfast", "-crf", "18",
+             segment_path],
+            check=True, capture_output=True
+        )
+        print(f"Extracted base segment at {target_width}x{target_height} to: {segment_path}")
 
-        final_clip = cropped_clip.resize(newsize=(target_width, target_height))
-        print(f"Resized to final resolution: {final_clip.size[0]}x{final_clip.size[1]}")
+        segment_clip = VideoFileClip(segment_path)
+        # set_audio(None) did no useful cleanup and rebuilt the clip; attach
+        # the real audio in one step
+        video_clip = segment_clip.set_audio(audio_clip)
+        final_clip = video_clip
 
         # --- Image Overlay Logic ---
         downloaded_image_paths = []
         if image_urls:
             print(f"Attempting to download {len(image_urls)} images for '{article_title}'...")
-            for url in image_urls:
-                path = download_image(url, TEMP_IMAGE_DIRECTORY)
-                if path:
-                    downloaded_image_paths.append(path)
-            
-            if downloaded_image_paths:
-                image_duration_per_clip = audio_duration / len(downloaded_image_paths)
-                print(f"Images will switch every {image_duration_per_clip:.2f} seconds.")
-            else:
+            # Downloads are latency-bound, so fetch them concurrently; map()
+            # keeps the results in article order
+            with ThreadPoolExecutor(max_workers=8) as download_pool:
+                downloaded_image_paths = [
+                    path for path in download_pool.map(
+                        lambda url: download_image(url, short_temp_dir), image_urls)
+                    if path
+                ]
+
+            if not downloaded_image_paths:
                 print("No images successfully downloaded for overlay.")
         else:
             print("No image URLs found for overlay.")
 
-        def draw_elements_on_frame(get_frame, t_in_clip):
-            image_array = get_frame(t_in_clip)
-            # Convert to RGBA for consistent handling of potential transparent overlays
-            img_pil = Image.fromarray(image_array.astype('uint8'), 'RGB').convert("RGBA")
-            draw = ImageDraw.Draw(img_pil)
-
-            t_actual_transcript = t_in_clip
-            
-            if int(t_in_clip * 10) % 10 == 0:
-                print(f"  Frame at t_in_clip: {t_in_clip:.2f}s (Time for subtitle lookup: {t_actual_transcript:.2f}s)")
-
-            # --- TITLE DRAWING LOGIC ---
-            font_path = "../data/fonts/sf-distant-galaxy-font/SfDistantGalaxy-0l3d.ttf"
-            text_color = (255, 255, 255, 255) # White, fully opaque RGBA
-
-            dynamic_fontsize = int(target_height * 0.055)
+        # --- TITLE OVERLAY PRE-RENDER ---
+        # The title never changes within a short, so it is rasterized exactly
+        # once here and alpha-blended onto each frame, instead of re-loading
+        # the font, re-wrapping and re-drawing the same text ~30x per second.
+        title_font = _load_font(int(target_height * 0.055))
+        text_color = (255, 255, 255, 255) # White, fully opaque RGBA
+        max_title_line_width = int(target_width * 0.85)
+        title_lines = dynamic_wrap_text(article_title, title_font, max_title_line_width)
+
+        title_overlay = Image.new("RGBA", (target_width, target_height), (0, 0, 0, 0))
+        title_draw = ImageDraw.Draw(title_overlay)
+        current_y_for_text = target_height * 0.02
+        total_title_height = 0
+        for line in title_lines:
             try:
-                title_font = ImageFont.truetype(font_path, dynamic_fontsize)
-            except IOError:
-                print(f"Warning: Could not load font '{font_path}' for title. Falling back to default.")
-                title_font = ImageFont.load_default()
-
-            max_title_line_width = int(target_width * 0.85)
-            title_lines = dynamic_wrap_text(article_title, title_font, max_title_line_width)
-
-            current_y_for_text = target_height * 0.02
-            total_title_height = 0
-
-            for line in title_lines:
-                try:
-                    bbox = draw.textbbox((0,0), line, font=title_font)
-                    line_width = bbox[2] - bbox[0]
-                    line_height = bbox[3] - bbox[1]
-                except AttributeError:
-                    line_width, line_height = draw.textsize(line, font=title_font)
-
-                x_pos = (img_pil.width - line_width) / 2
-                
-                draw.text((x_pos, current_y_for_text), line, font=title_font, fill=text_color)
-                
-                current_y_for_text += line_height + int(target_height * 0.005)
-                total_title_height += line_height + int(target_height * 0.005)
-
-            # --- IMAGE OVERLAY LOGIC ---
-            image_bottom_y = current_y_for_text
-            
-            if downloaded_image_paths:
-                image_index = int(t_in_clip / image_duration_per_clip) % len(downloaded_image_paths)
-                current_image_path = downloaded_image_paths[image_index]
-
+                bbox = title_draw.textbbox((0,0), line, font=title_font)
+                line_width = bbox[2] - bbox[0]
+                line_height = bbox[3] - bbox[1]
+            except AttributeError:
+                line_width, line_height = title_draw.textsize(line, font=title_font)
+
+            x_pos = (target_width - line_width) / 2
+            title_draw.text((x_pos, current_y_for_text), line, font=title_font, fill=text_color)
+            current_y_for_text += line_height + int(target_height * 0.005)
+            total_title_height += line_height + int(target_height * 0.005)
+
+        # Keep only the strip that actually contains title pixels
+        title_region_height = max(1, min(target_height, int(current_y_for_text)))
+        title_np = np.asarray(title_overlay.crop((0, 0, target_width, title_region_height)))
+        title_alpha = title_np[..., 3:].astype(np.uint16)
+        title_rgb = title_np[..., :3].astype(np.uint16)
+        title_bottom_y = current_y_for_text
+
+        # --- OVERLAY IMAGE PRE-RESIZE ---
+        # Lanczos-resampling the same image is identical work on every frame
+        # that shows it; resize each downloaded image once here and keep its
+        # RGBA planes plus placement ready for a per-frame NumPy blend.
+        overlay_cache = []
+        if downloaded_image_paths:
+            target_image_max_dim = int(target_width * 0.96)
+            image_y_pos = int((target_height * 0.02) + total_title_height + target_height * 0.03)
+            for image_path in downloaded_image_paths:
                 try:
-                    img_pil_overlay = Image.open(current_image_path).convert("RGBA")
-
-                    target_image_max_dim = int(target_width * 0.96)
-
+                    img_pil_overlay = Image.open(image_path)
+                    # Ask the JPEG decoder to decode straight to a smaller
+                    # size (2x the target keeps enough pixels for a clean
+                    # Lanczos pass); no-op for formats without draft support
+                    img_pil_overlay.draft('RGB',
+                                          (target_image_max_dim * 2, target_image_max_dim * 2))
                     orig_img_w, orig_img_h = img_pil_overlay.size
-
-                    scale_w = target_image_max_dim / orig_img_w
-                    scale_h = target_image_max_dim / orig_img_h
-                    scale = min(scale_w, scale_h)
-
-                    resized_img_w = int(orig_img_w * scale)
-                    resized_img_h = int(orig_img_h * scale)
-                    img_pil_overlay = img_pil_overlay.resize((resized_img_w, resized_img_h), Image.LANCZOS)
-
-                    image_x_pos = (target_width - resized_img_w) / 2
-                    image_y_pos = int((target_height * 0.02) + total_title_height + target_height * 0.03)
-                    
-                    # Paste the RGBA overlay onto the RGBA base image, using the overlay's alpha as a mask
-                    img_pil.paste(img_pil_overlay, (int(image_x_pos), int(image_y_pos)), img_pil_overlay)
-                    
-                    image_bottom_y = image_y_pos + resized_img_h + int(target_height * 0.03)
-
+                    if orig_img_w > target_image_max_dim or orig_img_h > target_image_max_dim:
+                        img_pil_overlay.thumbnail(
+                            (target_image_max_dim, target_image_max_dim),
+                            Image.LANCZOS, reducing_gap=2.0)
+                    else:
+                        # thumbnail never upscales, so small images keep the
+                        # old explicit resize to fill the overlay slot
+                        scale = min(target_image_max_dim / orig_img_w, target_image_max_dim / orig_img_h)
+                        img_pil_overlay = img_pil_overlay.resize(
+                            (int(orig_img_w * scale), int(orig_img_h * scale)), Image.LANCZOS)
+                    img_pil_overlay = img_pil_overlay.convert("RGBA")
+                    resized_img_w, resized_img_h = img_pil_overlay.size
+
+                    overlay_np = np.asarray(img_pil_overlay)
+                    overlay_cache.append({
+                        'rgb': overlay_np[..., :3].astype(np.uint16),
+                        'alpha': overlay_np[..., 3:].astype(np.uint16),
+                        'x': int((target_width - resized_img_w) / 2),
+                        'y': image_y_pos,
+                        'bottom_y': image_y_pos + resized_img_h + int(target_height * 0.03),
+                    })
                 except Exception as img_e:
-                    print(f"Error overlaying image {current_image_path} at time {t_in_clip:.2f}s: {img_e}")
-
-            # --- SUBTITLE DRAWING LOGIC ---
-            # Using same font size and style as title for consistency, but positioned at bottom
-            subtitle_font_size = int(target_height * 0.05) # Slightly smaller than title for readability
-            try:
-                subtitle_font = ImageFont.truetype(font_path, subtitle_font_size)
-            except IOError:
-                print(f"Warning: Could not load font '{font_path}' for subtitle. Falling back to default.")
-                subtitle_font = ImageFont.load_default()
-            
-            # Subtitle color: Bright yellow, fully opaque RGBA
-            subtitle_fill_color = (255, 255, 0, 255) # Yellow, fully opaque RGBA
-
-            current_subtitle_text = ""
-            for sub in subtitles:
-                if sub['start'] <= t_actual_transcript < sub['end']:
-                    current_subtitle_text = sub['text']
-                    if int(t_in_clip * 10) % 10 == 0:
-                        print(f"    Subtitle found: \"{current_subtitle_text}\" (SRT range: {sub['start']:.2f}-{sub['end']:.2f})")
-                    break
-            
-            if not current_subtitle_text and int(t_in_clip * 10) % 10 == 0:
-                 print(f"    No subtitle found for actual transcript time {t_actual_transcript:.2f}s.")
-
-            if current_subtitle_text:
-                max_subtitle_line_width = int(target_width * 0.9)
-                subtitle_lines = dynamic_wrap_text(current_subtitle_text, subtitle_font, max_subtitle_line_width)
-
-                total_subtitle_height = 0
-                dummy_draw = ImageDraw.Draw(Image.new("RGBA", (1,1))) # Use RGBA for dummy
-                for line in subtitle_lines:
-                     try:
-                        bbox = dummy_draw.textbbox((0,0), line, font=subtitle_font)
-                        total_subtitle_height += (bbox[3] - bbox[1]) + int(target_height * 0.005)
-                     except AttributeError:
-                        _, line_h = dummy_draw.textsize(line, font=subtitle_font)
-                        total_subtitle_height += line_h + int(target_height * 0.005)
-
-                target_bottom_margin = int(target_height * 0.18)
-                # Calculate the Y position for the bottom of the lowest subtitle line
-                desired_y_for_bottom_of_subtitles = target_height - target_bottom_margin
-                
-                # Calculate the starting Y position for the *first* subtitle line
-                current_y_for_subtitle = desired_y_for_bottom_of_subtitles - total_subtitle_height
-
-                # Ensure subtitles don't overlap with images/title if they are too long
-                subtitle_y_start_after_elements = image_bottom_y + int(target_height * 0.02) # Add a small buffer below image
-                if current_y_for_subtitle < subtitle_y_start_after_elements:
-                    current_y_for_subtitle = subtitle_y_start_after_elements
-                    print(f"      Adjusted subtitle start Y to {current_y_for_subtitle:.0f} to avoid overlap.")
-
-                for line in subtitle_lines:
-                    try:
-                        bbox = draw.textbbox((0,0), line, font=subtitle_font)
-                        line_width = bbox[2] - bbox[0]
-                        line_height = bbox[3] - bbox[1]
-                    except AttributeError:
-                        line_width, line_height = draw.textsize(line, font=subtitle_font)
-
-                    x_pos = (img_pil.width - line_width) / 2
-                    
-                    if int(t_in_clip * 10) % 10 == 0:
-                        print(f"      Drawing subtitle: '{line}' at X={x_pos}, Y={current_y_for_subtitle}, W={line_width}, H={line_height}, Color={subtitle_fill_color}")
-                    
-                    # Draw a solid black rectangle behind the subtitle for better contrast,
-                    # ensuring it's opaque and drawn *before* the text.
-                    padding_x = int(target_width * 0.01) # Small padding around text
-                    padding_y = int(target_height * 0.005)
-                    background_box_x1 = x_pos - padding_x
-                    background_box_y1 = current_y_for_subtitle - padding_y
-                    background_box_x2 = x_pos + line_width + padding_x
-                    background_box_y2 = current_y_for_subtitle + line_height + padding_y
-                    
-                    # Ensure coordinates are within bounds
-                    background_box_x1 = max(0, background_box_x1)
-                    background_box_y1 = max(0, background_box_y1)
-                    background_box_x2 = min(target_width, background_box_x2)
-                    background_box_y2 = min(target_height, background_box_y2)
-
-                    draw.rectangle([background_box_x1, background_box_y1, background_box_x2, background_box_y2],
-                                   fill=(0, 0, 0, 180)) # Semi-transparent black background
-
-                    draw.text((x_pos, current_y_for_subtitle), line, font=subtitle_font, fill=subtitle_fill_color)
-                    current_y_for_subtitle += line_height + int(target_height * 0.005)
-            
-            # Convert back to RGB before returning to MoviePy
-            return np.array(img_pil.convert("RGB"))
-
-        final_clip_with_elements = final_clip.fl(draw_elements_on_frame)
+                    print(f"Error preparing overlay image {image_path}: {img_e}")
+
+        if overlay_cache:
+            image_duration_per_clip = audio_duration / len(overlay_cache)
+            print(f"Images will switch every {image_duration_per_clip:.2f} seconds.")
+
+        subtitle_font = _load_font(int(target_height * 0.05)) # Slightly smaller than title for readability
+
+        # --- SUBTITLE STRIP PRE-RENDER ---
+        # A cue is typically visible for 30-90 frames, and the old callback
+        # re-wrapped and re-drew the same text on each of them. Rasterize every
+        # cue once into an RGBA strip (background boxes + yellow text) and keep
+        # the start times sorted for a binary-search lookup per frame.
+        max_subtitle_line_width = int(target_width * 0.9)
+        subtitle_line_spacing = int(target_height * 0.005)
+        subtitle_padding_x = int(target_width * 0.01) # Small padding around text
+        subtitle_padding_y = int(target_height * 0.005)
+        measure_draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        subtitle_rgb = []
+        subtitle_alpha = []
+        subtitle_heights = []
+        for text in subtitles['texts']:
+            subtitle_lines = dynamic_wrap_text(text, subtitle_font, max_subtitle_line_width)
+            line_dims = []
+            strip_height = 0
+            for line in subtitle_lines:
+                try:
+                    bbox = measure_draw.textbbox((0,0), line, font=subtitle_font)
+                    line_width, line_height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+                except AttributeError:
+                    line_width, line_height = measure_draw.textsize(line, font=subtitle_font)
+                line_dims.append((line, line_width, line_height))
+                strip_height += line_height + subtitle_line_spacing
+
+            strip = Image.new("RGBA", (target_width, max(1, strip_height + subtitle_padding_y)), (0, 0, 0, 0))
+            strip_draw = ImageDraw.Draw(strip)
+            strip_y = 0
+            for line, line_width, line_height in line_dims:
+                x_pos = (target_width - line_width) / 2
+                # Solid-ish black box behind each line for contrast, drawn first
+                strip_draw.rectangle([max(0, x_pos - subtitle_padding_x),
+                                      max(0, strip_y - subtitle_padding_y),
+                                      min(target_width, x_pos + line_width + subtitle_padding_x),
+                                      strip_y + line_height + subtitle_padding_y],
+                                     fill=(0, 0, 0, 180)) # Semi-transparent black background
+                strip_draw.text((x_pos, strip_y), line, font=subtitle_font, fill=(255, 255, 0, 255))
+                strip_y += line_height + subtitle_line_spacing
+
+            strip_np = np.asarray(strip)
+            subtitle_alpha.append(strip_np[..., 3:].astype(np.uint16))
+            subtitle_rgb.append(strip_np[..., :3].astype(np.uint16))
+            subtitle_heights.append(strip_height)
+        # Cue boundaries come out of parse_srt as flat float arrays already;
+        # the per-frame lookup is one C-level searchsorted plus a comparison
+        subtitle_starts = subtitles['starts']
+        subtitle_ends = subtitles['ends']
+        subtitle_texts = subtitles['texts']
+
+        def composite_batch(frames, first_frame_index):
+            """Draws the title, image overlay and subtitles onto a batch of
+            frames in place. frames is an (n, height, width, 3) uint8 array."""
+            # The title is identical on every frame, so it blends across the
+            # whole batch in one vectorized pass
+            _blend_overlay(frames[:, :title_region_height], title_rgb, title_alpha)
+
+            for offset in range(frames.shape[0]):
+                frame = frames[offset]
+                t_in_clip = (first_frame_index + offset) / OUTPUT_FPS
+                t_actual_transcript = t_in_clip
+
+                if DEBUG and int(t_in_clip * 10) % 10 == 0:
+                    print(f"  Frame at t_in_clip: {t_in_clip:.2f}s (Time for subtitle lookup: {t_actual_transcript:.2f}s)")
+
+                # --- IMAGE OVERLAY BLEND (cached, pre-resized planes) ---
+                image_bottom_y = title_bottom_y
+
+                if overlay_cache:
+                    image_index = int(t_in_clip / image_duration_per_clip) % len(overlay_cache)
+                    overlay = overlay_cache[image_index]
+                    y0, x0 = overlay['y'], overlay['x']
+                    overlay_height = min(overlay['rgb'].shape[0], target_height - y0)
+                    if overlay_height > 0:
+                        region = frame[y0:y0 + overlay_height, x0:x0 + overlay['rgb'].shape[1]]
+                        _blend_overlay(region, overlay['rgb'][:overlay_height],
+                                       overlay['alpha'][:overlay_height])
+                    image_bottom_y = overlay['bottom_y']
+
+                # --- SUBTITLE BLEND (cached strips, searchsorted lookup) ---
+                sub_index = int(np.searchsorted(subtitle_starts, t_actual_transcript, side='right')) - 1
+                sub_active = sub_index >= 0 and subtitle_ends[sub_index] > t_actual_transcript
+
+                if DEBUG and int(t_in_clip * 10) % 10 == 0:
+                    if sub_active:
+                        print(f"    Subtitle found: \"{subtitle_texts[sub_index]}\" (SRT range: {subtitle_starts[sub_index]:.2f}-{subtitle_ends[sub_index]:.2f})")
+                    else:
+                        print(f"    No subtitle found for actual transcript time {t_actual_transcript:.2f}s.")
+
+                if sub_active:
+                    target_bottom_margin = int(target_height * 0.18)
+                    # Calculate the Y position for the bottom of the lowest subtitle line
+                    desired_y_for_bottom_of_subtitles = target_height - target_bottom_margin
+
+                    # Calculate the starting Y position for the *first* subtitle line
+                    current_y_for_subtitle = desired_y_for_bottom_of_subtitles - subtitle_heights[sub_index]
+
+                    # Ensure subtitles don't overlap with images/title if they are too long
+                    subtitle_y_start_after_elements = image_bottom_y + int(target_height * 0.02) # Add a small buffer below image
+                    if current_y_for_subtitle < subtitle_y_start_after_elements:
+                        current_y_for_subtitle = subtitle_y_start_after_elements
+                        if DEBUG:
+                            print(f"      Adjusted subtitle start Y to {current_y_for_subtitle:.0f} to avoid overlap.")
+
+                    y0 = max(0, int(current_y_for_subtitle))
+                    y1 = min(target_height, y0 + subtitle_rgb[sub_index].shape[0])
+                    if y1 > y0:
+                        _blend_overlay(frame[y0:y1], subtitle_rgb[sub_index][:y1 - y0],
+                                       subtitle_alpha[sub_index][:y1 - y0])
+
+            return frames
 
         sanitized_category_folder = re.sub(r'[\\/*?:"<>|]', "", category_folder).strip()
         if not sanitized_category_folder:
@@ -501,22 +697,45 @@ def create_youtube_short(
         sanitized_title = re.sub(r'[\\/*?:"<>\'"]', "", article_title.replace('/', '_'))
         output_filepath = os.path.join(output_category_dir, f"{sanitized_title}_short.mp4")
 
+        # Stream composited frames straight into one ffmpeg encoder process in
+        # batches: no per-frame Python callback, no PIL roundtrip, and the
+        # audio muxes in the same pass
         print(f"Writing final video to: {output_filepath}")
-        final_clip_with_elements.write_videofile(
-            output_filepath, 
-            codec="libx264", 
-            audio_codec="libmp3lame", 
-            fps=30, 
-            preset="medium",
-            threads=os.cpu_count(),
-            verbose=True, 
-            logger='bar'
-        )
+        video_codec, video_preset = _pick_video_codec()
+        encoder_cmd = [
+            "ffmpeg", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{target_width}x{target_height}", "-r", str(OUTPUT_FPS), "-i", "-",
+            "-i", audio_filepath,
+            "-map", "0:v", "-map", "1:a",
+            "-c:v", video_codec, "-preset", video_preset,
+            "-b:v", "6M", "-maxrate", "8M", "-bufsize", "12M",
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest",
+            "-threads", str(ENCODER_THREADS),
+            output_filepath,
+        ]
+        encoder = subprocess.Popen(encoder_cmd, stdin=subprocess.PIPE)
+        try:
+            frame_index = 0
+            batch = []
+            for frame in final_clip.iter_frames(fps=OUTPUT_FPS, dtype='uint8'):
+                batch.append(frame)
+                if len(batch) == FRAME_BATCH:
+                    encoder.stdin.write(composite_batch(np.stack(batch), frame_index).tobytes())
+                    frame_index += len(batch)
+                    batch = []
+            if batch:
+                encoder.stdin.write(composite_batch(np.stack(batch), frame_index).tobytes())
+        finally:
+            encoder.stdin.close()
+            encoder.wait()
+        if encoder.returncode != 0:
+            raise RuntimeError(f"ffmpeg encoder exited with code {encoder.returncode}")
 
         audio_clip.close()
-        main_video_clip.close()
-        video_clip.close() 
-        cropped_clip.close() 
+        video_clip.close()
+        segment_clip.close()
         final_clip.close()
 
         print(f"Successfully created short for '{article_title}'.")
@@ -528,15 +747,47 @@ def create_youtube_short(
         traceback.print_exc() # Print full traceback for better debugging
         try:
             if 'audio_clip' in locals() and audio_clip: audio_clip.close()
-            if 'main_video_clip' in locals() and main_video_clip: main_video_clip.close()
             if 'video_clip' in locals() and video_clip: video_clip.close()
-            if 'cropped_clip' in locals() and cropped_clip: cropped_clip.close()
+            if 'segment_clip' in locals() and segment_clip: segment_clip.close()
             if 'final_clip' in locals() and final_clip: final_clip.close()
         except Exception as close_e:
             print(f"Error closing clips: {close_e}")
         return False
     finally:
-        clean_temp_images(TEMP_IMAGE_DIRECTORY)
+        clean_temp_images(short_temp_dir)
+
+def _scan_generated_tree(directory, suffix):
+    """Maps (category folder, title) to the path of every file under directory
+    ending in suffix, in one scandir pass. The pairing loop in __main__ then
+    runs on dict lookups instead of an os.path.exists stat per candidate."""
+    mapping = {}
+    if not os.path.isdir(directory):
+        return mapping
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        for entry in os.scandir(current):
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.endswith(suffix):
+                category_folder = os.path.basename(current)
+                title = entry.name[:-len(suffix)]
+                mapping[(category_folder, title)] = entry.path
+    return mapping
+
+def _run_one(task):
+    """Pool worker entry point: renders a single short and reports back."""
+    audio_filepath, article_title, category_folder, image_urls, srt_filepath = task
+    short_created = create_youtube_short(
+        audio_filepath,
+        _ensure_preprocessed_footage(MINECRAFT_FOOTAGE_PATH),
+        GENERATED_SHORTS_DIRECTORY,
+        article_title,
+        category_folder,
+        image_urls,
+        srt_filepath
+    )
+    return article_title, short_created
 
 # --- Main Execution Logic ---
 if __name__ == "__main__":
@@ -546,53 +797,56 @@ if __name__ == "__main__":
     processed_shorts_titles = get_processed_shorts_titles(TRACKING_SHORTS_FILE)
     print(f"Loaded {len(processed_shorts_titles)} previously created shorts titles.")
 
-    for root, dirs, files in os.walk(GENERATED_AUDIO_DIRECTORY):
-        category_folder = os.path.basename(root)
-
-        for filename in files:
-            if filename.endswith(".mp3"):
-                audio_filepath = os.path.join(root, filename)
-                
-                article_title = os.path.splitext(filename)[0]
-
-                if article_title in processed_shorts_titles:
-                    print(f"\n'{article_title}' has already had a short created. Skipping.")
-                    continue
-
-                print(f"\nProcessing audio file: {audio_filepath} for short creation.")
-                
-                article_content = ""
-                article_text_filepath = os.path.join(GENERATED_ARTICLES_DIRECTORY, category_folder, f"{article_title}.txt")
-                if os.path.exists(article_text_filepath):
-                    with open(article_text_filepath, 'r', encoding='utf-8') as f:
-                        article_content = f.read()
-                    print(f"Loaded article content from: {article_text_filepath}")
-                else:
-                    print(f"Warning: No article text file found for '{article_title}' at {article_text_filepath}. No images will be extracted.")
-                
-                image_urls = extract_image_urls_from_article(article_content)
-                if image_urls:
-                    print(f"Found {len(image_urls)} image URLs in article.")
-                else:
-                    print("No image URLs found in article content.")
+    # Build the cropped/scaled footage copy up front so pool workers only ever
+    # find it ready instead of racing to transcode it
+    _ensure_preprocessed_footage(MINECRAFT_FOOTAGE_PATH)
+
+    # Collect the pending shorts first, then render them in parallel: every
+    # short is independent, so idle cores can work while another short sits in
+    # an encode or download stall
+    # One directory pre-pass per tree, then the pairing loop below never
+    # touches the filesystem again
+    audio_files = _scan_generated_tree(GENERATED_AUDIO_DIRECTORY, ".mp3")
+    article_files = _scan_generated_tree(GENERATED_ARTICLES_DIRECTORY, ".txt")
+    srt_files = _scan_generated_tree(GENERATED_TRANSCRIPT_DIRECTORY, ".srt")
+
+    worklist = []
+    for (category_folder, article_title), audio_filepath in audio_files.items():
+        if article_title in processed_shorts_titles:
+            print(f"\n'{article_title}' has already had a short created. Skipping.")
+            continue
+
+        print(f"\nQueueing audio file: {audio_filepath} for short creation.")
+
+        article_content = ""
+        article_text_filepath = article_files.get((category_folder, article_title))
+        if article_text_filepath:
+            with open(article_text_filepath, 'r', encoding='utf-8') as f:
+                article_content = f.read()
+            print(f"Loaded article content from: {article_text_filepath}")
+        else:
+            print(f"Warning: No article text file found for '{article_title}' in {GENERATED_ARTICLES_DIRECTORY}/{category_folder}. No images will be extracted.")
+
+        image_urls = extract_image_urls_from_article(article_content)
+        if image_urls:
+            print(f"Found {len(image_urls)} image URLs in article.")
+        else:
+            print("No image URLs found in article content.")
 
-                srt_filepath = os.path.join(GENERATED_TRANSCRIPT_DIRECTORY, category_folder, f"{article_title}.srt")
+        srt_filepath = srt_files.get(
+            (category_folder, article_title),
+            os.path.join(GENERATED_TRANSCRIPT_DIRECTORY, category_folder, f"{article_title}.srt"))
 
-                short_created = create_youtube_short(
-                    audio_filepath,
-                    MINECRAFT_FOOTAGE_PATH,
-                    GENERATED_SHORTS_DIRECTORY,
-                    article_title,
-                    category_folder,
-                    image_urls,
-                    srt_filepath 
-                )
+        worklist.append((audio_filepath, article_title, category_folder, image_urls, srt_filepath))
 
+    if worklist:
+        with multiprocessing.Pool(SHORT_POOL_WORKERS) as pool:
+            for article_title, short_created in pool.imap_unordered(_run_one, worklist):
                 if short_created:
                     log_processed_short_title(article_title, TRACKING_SHORTS_FILE)
                     print(f"Short creation and logging complete for '{article_title}'.")
                 else:
                     print(f"Short creation failed for '{article_title}'. Not logging.")
-    
+
     print("\n--- All short creations complete. ---")
     clean_temp_images(TEMP_IMAGE_DIRECTORY)
\ No newline at end of file
@@ -1,13 +1,24 @@
 import os
-import glob
+import functools
+import hashlib
+import json
 import pickle
+import queue
+import re
 import datetime
 import logging
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import httplib2
+import google_auth_httplib2
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
@@ -15,8 +26,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # --- Configuration ---
-CLIENT_SECRETS_FILE = r'C:\egyetem\github-ml\holocron-generator\client_secret_12090445080-o5mvqmklk0ac7uu7q4co9hib5sgi01fn.apps.googleusercontent.com.json'
+# OAuth client secrets path comes from the environment (.env is loaded
+# above), so CI machines and containers can each mount their own secrets
+# file; the old local path stays as the fallback
+CLIENT_SECRETS_FILE = os.environ.get(
+    'YT_CLIENT_SECRETS',
+    r'C:\egyetem\github-ml\holocron-generator\client_secret_12090445080-o5mvqmklk0ac7uu7q4co9hib5sgi01fn.apps.googleusercontent.com.json')
 UPLOADED_LOG_FILE = '../data/uploaded_shorts.log'
+# Pickled sidecar holding the already-normalized set of uploaded paths, so
+# startup is one unpickle instead of parsing the log line by line
+UPLOADED_SET_FILE = '../data/uploaded_shorts.set.pickle'
 BASE_VIDEO_DIR = '../data/generated_shorts'
 BASE_TEXT_DIR = '../data/generated_text'
 
@@ -25,6 +44,71 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 API_SERVICE_NAME = 'youtube'
 API_VERSION = 'v3'
 
+# Concurrent upload sessions: a handful of parallel streams saturates the
+# uplink without raising the failure rate, so uploads no longer sit idle on
+# the network one at a time
+UPLOAD_WORKERS = int(os.getenv('YT_UPLOAD_CONCURRENCY', '4'))
+
+# Resumable upload chunk size. chunksize=-1 buffered the whole file for one
+# PUT, which multiplies RAM by worker count and restarts the entire file on a
+# transient failure; 8 MiB chunks (a multiple of the 256 KiB API minimum)
+# bound memory to chunk * workers and make retries cheap.
+UPLOAD_CHUNK_SIZE = int(os.getenv('YT_CHUNK_SIZE', str(8 * 1024 * 1024)))
+
+# Transient server-side errors worth retrying with exponential backoff
+RETRIABLE_STATUS_CODES = {500, 502, 503, 504}
+MAX_UPLOAD_RETRIES = 5
+
+# Log resumable progress only every Nth chunk to keep stdout quiet
+PROGRESS_LOG_EVERY = 4
+
+# Files below this size go up as one non-resumable multipart request: a
+# resumable session costs an extra init and finalize round trip, which
+# dominates the transfer time for small shorts
+MULTIPART_THRESHOLD = 5 * 1024 * 1024
+
+# Description files are prefetched in parallel once a run has more than this
+# many pending videos; below it the thread-pool startup is not worth it
+DESCRIPTION_PREFETCH_MIN = 20
+
+# Refresh the access token this many seconds before it expires, so workers
+# never hit a synchronous refresh mid-upload
+TOKEN_REFRESH_MARGIN = 300
+
+# Upload size sanity bounds: zero-byte files are encoder failures, and the
+# YouTube API rejects anything past 256 GiB outright
+MAX_UPLOAD_SIZE = 256 * 1024 * 1024 * 1024
+
+# Client-side pacing for videos.insert: each call costs 1600 quota units, and
+# letting the pool burst uploads triggers 403 quotaExceeded responses whose
+# backoff penalty is far worse than a steadily paced queue
+UPLOADS_PER_MIN = float(os.getenv('YT_UPLOADS_PER_MIN', '6'))
+
+class _TokenBucket:
+    """Minimal token bucket: acquire() blocks until a token is free, with
+    tokens refilled at the configured rate up to a small burst capacity."""
+    def __init__(self, rate_per_min, capacity=2.0):
+        self._rate = rate_per_min / 60.0
+        self._capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._last_refill) * self._rate)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_seconds = (1.0 - self._tokens) / self._rate
+            time.sleep(wait_seconds)
+
+_upload_rate_limiter = _TokenBucket(UPLOADS_PER_MIN)
+
 # General hashtags to append to all descriptions
 GLOBAL_HASHTAGS = [
     '#shorts',
@@ -45,6 +129,21 @@ GLOBAL_HASHTAGS = [
     '#force'
 ]
 
+# Derived from GLOBAL_HASHTAGS once at module load; both are constant, so
+# there is no point re-joining/re-stripping them for every video
+HASHTAG_SUFFIX = "\n\n" + " ".join(GLOBAL_HASHTAGS)
+GLOBAL_TAG_NAMES = tuple(h.lstrip('#') for h in GLOBAL_HASHTAGS)
+
+# Strips the trailing '_short' the video filenames carry, compiled once
+# instead of an endswith/removesuffix pair per file
+_SHORT_SUFFIX_RE = re.compile(r'_short$')
+
+@functools.lru_cache(maxsize=4096)
+def _format_title(stem):
+    """Turns a file stem into a display title; cached since the same stems
+    recur whenever discovery runs more than once per session (e.g. retries)."""
+    return stem.replace('_', ' ').title()
+
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -54,8 +153,18 @@ logging.basicConfig(level=logging.INFO,
                     ])
 
 # --- OAuth Authentication Function ---
-def get_authenticated_service():
-    """Authenticates with Google OAuth and returns a YouTube API service."""
+def _save_token(credentials):
+    """Persists credentials atomically: pickle into a temp file, then
+    os.replace it over token.pickle, so a crash mid-write can never leave a
+    truncated token behind that would force a fresh browser OAuth prompt."""
+    tmp_path = 'token.pickle.tmp'
+    with open(tmp_path, 'wb') as token:
+        pickle.dump(credentials, token, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, 'token.pickle')
+
+def get_credentials():
+    """Runs the OAuth flow (or loads/refreshes cached credentials) and
+    returns the credentials object."""
     credentials = None
     # Load credentials from token.pickle if it exists
     if os.path.exists('token.pickle'):
@@ -67,12 +176,16 @@ def get_authenticated_service():
             logging.warning(f"Error loading token.pickle: {e}. Will re-authenticate.")
             credentials = None
 
-    # If no valid credentials, initiate the OAuth flow
+    # If no valid credentials, initiate the OAuth flow. Only credentials that
+    # were actually refreshed or newly created get written back to disk:
+    # loading a still-valid token should not cost a pickle rewrite per run.
+    dirty = False
     if not credentials or not credentials.valid:
         if credentials and credentials.expired and credentials.refresh_token:
             logging.info("Access token expired, attempting to refresh...")
             try:
                 credentials.refresh(Request())
+                dirty = True
                 logging.info("Access token refreshed successfully.")
             except Exception as e:
                 logging.error(f"Error refreshing token: {e}. Re-initiating full OAuth flow.")
@@ -80,28 +193,105 @@ def get_authenticated_service():
         else:
             logging.info("No valid credentials, initiating new OAuth flow...")
             try:
+                if not os.path.exists(CLIENT_SECRETS_FILE):
+                    raise FileNotFoundError(
+                        f"Client secrets file not found: {CLIENT_SECRETS_FILE}. "
+                        "Set YT_CLIENT_SECRETS to the client_secret json path.")
                 flow = InstalledAppFlow.from_client_secrets_file(
                     CLIENT_SECRETS_FILE, SCOPES)
                 # This will open a browser for the user to authorize
                 credentials = flow.run_local_server(port=0)
+                dirty = True
                 logging.info("OAuth flow completed successfully.")
             except Exception as e:
                 logging.error(f"Failed to complete OAuth flow: {e}")
                 raise # Re-raise the exception to stop execution
 
+    if dirty:
         # Save the new/refreshed credentials
         try:
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(credentials, token)
+            _save_token(credentials)
             logging.info("Credentials saved to token.pickle")
         except Exception as e:
             logging.error(f"Failed to save credentials to token.pickle: {e}")
             # Non-fatal, but user might need to re-auth more often
 
-    return build(API_SERVICE_NAME, API_VERSION, credentials=credentials)
+    _start_refresh_thread(credentials)
+    return credentials
+
+_refresh_thread = None
+_refresh_lock = threading.Lock()
+
+def _refresh_loop(credentials):
+    """Daemon loop that refreshes the shared credentials shortly before they
+    expire. Without it, the first worker to hit an expired token refreshes
+    synchronously while every other worker blocks behind it."""
+    while True:
+        expiry = credentials.expiry
+        if expiry is None:
+            return
+        wait_seconds = (expiry - datetime.datetime.utcnow()).total_seconds() - TOKEN_REFRESH_MARGIN
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        with _refresh_lock:
+            try:
+                credentials.refresh(Request())
+                logging.info("Proactively refreshed access token in the background.")
+            except Exception as e:
+                logging.warning(f"Background token refresh failed: {e}")
+                return
+        # Persist only because the token actually changed, matching the
+        # dirty-only policy in get_credentials
+        try:
+            _save_token(credentials)
+        except Exception as e:
+            logging.error(f"Failed to save credentials to token.pickle: {e}")
+
+def _start_refresh_thread(credentials):
+    global _refresh_thread
+    if (_refresh_thread is None or not _refresh_thread.is_alive()) and credentials.refresh_token:
+        _refresh_thread = threading.Thread(target=_refresh_loop, args=(credentials,), daemon=True)
+        _refresh_thread.start()
+
+# Built services cached per credentials object, so repeated main() calls in
+# one process do not rebuild the client. static_discovery=True on every
+# build() below reads the discovery document bundled with the library, so no
+# run ever fetches the ~200 KB discovery JSON over HTTP.
+_service_cache = {}
+
+def get_authenticated_service():
+    """Authenticates with Google OAuth and returns a YouTube API service."""
+    credentials = get_credentials()
+    key = id(credentials)
+    if key not in _service_cache:
+        _service_cache[key] = build(API_SERVICE_NAME, API_VERSION,
+                                    credentials=credentials,
+                                    static_discovery=True)
+    return _service_cache[key]
+
+# Service objects (and the httplib2 transport underneath) are not thread
+# safe, so each upload worker builds its own from the shared credentials and
+# keeps it for the rest of its lifetime
+_thread_state = threading.local()
+
+def _service_for_thread(credentials):
+    """Returns this thread's YouTube service, building it on first use.
+
+    The service sits on an explicit AuthorizedHttp transport so the worker
+    keeps one TCP+TLS connection alive across all of its uploads, instead of
+    paying a handshake per resumable session. httplib2.Http is not thread
+    safe, which is why the transport lives in the thread local too."""
+    if not hasattr(_thread_state, 'service'):
+        authorized_http = google_auth_httplib2.AuthorizedHttp(
+            credentials, http=httplib2.Http(cache=None, timeout=600))
+        _thread_state.service = build(API_SERVICE_NAME, API_VERSION,
+                                      http=authorized_http,
+                                      cache_discovery=False,
+                                      static_discovery=True)
+    return _thread_state.service
 
 # --- Video Upload Function ---
-def upload_video(youtube_service, video_path, title, description, tags, category_id='24', privacy_status='public'):
+def upload_video(youtube_service, video_path, title, description, tags, category_id='24', privacy_status='public', file_size=None):
     """
     Uploads a video to YouTube.
 
@@ -113,6 +303,8 @@ def upload_video(youtube_service, video_path, title, description, tags, category
         tags (list): List of tags for the video.
         category_id (str): YouTube category ID (default '22' for People & Blogs).
         privacy_status (str): 'public', 'private', or 'unlisted'.
+        file_size (int): Size of the file in bytes, if the caller already
+            stat'ed it; avoids a second getsize here.
 
     Returns:
         str: The YouTube video ID if successful, None otherwise.
@@ -134,7 +326,15 @@ def upload_video(youtube_service, video_path, title, description, tags, category
         }
     }
 
-    media_body = MediaFileUpload(video_path, chunksize=-1, resumable=True)
+    if file_size is None:
+        file_size = os.path.getsize(video_path)
+    resumable = file_size >= MULTIPART_THRESHOLD
+    # Hand the transport an open handle so it reads one chunk at a time
+    # instead of materializing the file; the handle is closed in the finally
+    # below once the upload is finished either way
+    video_handle = open(video_path, 'rb', buffering=UPLOAD_CHUNK_SIZE)
+    media_body = MediaIoBaseUpload(video_handle, mimetype='video/mp4',
+                                   chunksize=UPLOAD_CHUNK_SIZE, resumable=resumable)
 
     try:
         request = youtube_service.videos().insert(
@@ -142,11 +342,43 @@ def upload_video(youtube_service, video_path, title, description, tags, category
             body=body,
             media_body=media_body
         )
+        if not resumable:
+            # Small file: one multipart POST, no session init/finalize trips
+            response = request.execute()
+            if 'id' in response:
+                logging.info(f"Successfully uploaded: '{title}' (Video ID: {response['id']})")
+                return response['id']
+            logging.error(f"Upload failed for {os.path.basename(video_path)} with unexpected response: {response}")
+            return None
+
         response = None
+        retries = 0
+        chunk_count = 0
         while response is None:
-            status, response = request.next_chunk()
-            if status:
-                logging.info(f"Uploaded {int(status.resumable_progress * 100)}% of {os.path.basename(video_path)}")
+            try:
+                status, response = request.next_chunk()
+            except HttpError as e:
+                if e.resp.status in RETRIABLE_STATUS_CODES and retries < MAX_UPLOAD_RETRIES:
+                    retries += 1
+                    sleep_seconds = (2 ** retries) + random.random()
+                    logging.warning(f"Retriable HTTP {e.resp.status} uploading {os.path.basename(video_path)}; "
+                                    f"retrying in {sleep_seconds:.1f}s ({retries}/{MAX_UPLOAD_RETRIES})")
+                    time.sleep(sleep_seconds)
+                    continue
+                raise
+            except socket.timeout:
+                if retries < MAX_UPLOAD_RETRIES:
+                    retries += 1
+                    sleep_seconds = (2 ** retries) + random.random()
+                    logging.warning(f"Socket timeout uploading {os.path.basename(video_path)}; "
+                                    f"retrying in {sleep_seconds:.1f}s ({retries}/{MAX_UPLOAD_RETRIES})")
+                    time.sleep(sleep_seconds)
+                    continue
+                raise
+            retries = 0 # A successful chunk resets the backoff budget
+            chunk_count += 1
+            if status and chunk_count % PROGRESS_LOG_EVERY == 0:
+                logging.info(f"Uploaded {int(status.progress() * 100)}% of {os.path.basename(video_path)}")
 
         if 'id' in response:
             logging.info(f"Successfully uploaded: '{title}' (Video ID: {response['id']})")
@@ -161,117 +393,314 @@ def upload_video(youtube_service, video_path, title, description, tags, category
     except Exception as e:
         logging.error(f"An unexpected error occurred during upload for {os.path.basename(video_path)}: {e}")
         return None
+    finally:
+        video_handle.close()
 
 # --- File Management and Logging ---
-def get_uploaded_videos():
-    """Reads the log file and returns a set of already uploaded video file paths."""
-    uploaded_files = set()
+
+# In-memory copy of the uploaded index ({'paths': set, 'hashes': set}), kept
+# in sync with the sidecar so appends during the run do not re-read anything
+_uploaded_index = None
+
+def _save_uploaded_index(index):
+    """Writes the uploaded paths/hashes index to the pickle sidecar."""
+    try:
+        with open(UPLOADED_SET_FILE, 'wb') as f:
+            pickle.dump(index, f)
+    except Exception as e:
+        logging.warning(f"Could not update {UPLOADED_SET_FILE}: {e}")
+
+def get_uploaded_index():
+    """Returns the uploaded index: a dict with the set of already uploaded
+    video 'paths' and their content 'hashes'.
+
+    Fast path is one unpickle of the sidecar; the log itself is only parsed
+    when the sidecar is missing, stale or in the pre-hash format, and the
+    sidecar is rebuilt afterwards."""
+    global _uploaded_index
+    if os.path.exists(UPLOADED_SET_FILE):
+        try:
+            if (not os.path.exists(UPLOADED_LOG_FILE)
+                    or os.path.getmtime(UPLOADED_SET_FILE) >= os.path.getmtime(UPLOADED_LOG_FILE)):
+                with open(UPLOADED_SET_FILE, 'rb') as f:
+                    loaded = pickle.load(f)
+                if isinstance(loaded, dict) and 'paths' in loaded and 'hashes' in loaded:
+                    _uploaded_index = loaded
+                    return _uploaded_index
+                # Older sidecars pickled a bare path set; fall through and
+                # rebuild from the log to pick up any recorded hashes
+        except Exception as e:
+            logging.warning(f"Error loading {UPLOADED_SET_FILE}: {e}. Rebuilding from log.")
+
+    index = {'paths': set(), 'hashes': set()}
     if os.path.exists(UPLOADED_LOG_FILE):
         with open(UPLOADED_LOG_FILE, 'r', encoding='utf-8') as f:
             for line in f:
-                parts = line.strip().split(' | ')
+                line = line.strip()
+                if not line:
+                    continue
+                # New entries are JSON lines; older logs used 'ts | path | id | title'
+                if line.startswith('{'):
+                    try:
+                        record = json.loads(line)
+                        index['paths'].add(os.path.normpath(record['path']))
+                        if record.get('hash'):
+                            index['hashes'].add(record['hash'])
+                        continue
+                    except (ValueError, KeyError):
+                        pass
+                parts = line.split(' | ')
                 if len(parts) >= 2:
-                    # Get the path from the log file
-                    logged_path = parts[1]
+                    # os.path.normpath keeps '/' and '\' separators consistent
+                    # with how paths are written at log time
+                    index['paths'].add(os.path.normpath(parts[1]))
 
-                    # --- NEW CHANGE HERE ---
-                    # Normalize the logged path to match os.path.relpath's output
-                    # This often means converting '/' to '\' on Windows or vice versa.
-                    # os.path.normpath() is good for this, it handles / and \ consistently.
-                    normalized_logged_path = os.path.normpath(logged_path)
+    _save_uploaded_index(index)
+    _uploaded_index = index
+    return _uploaded_index
 
-                    uploaded_files.add(normalized_logged_path)
-                    # --- END OF NEW CHANGE ---
+def _video_content_hash(video_path):
+    """Returns the blake2b digest of a video file, cached in a sidecar .hash
+    file keyed on the video's mtime so unchanged files are hashed only once.
 
-    return uploaded_files
+    Content-hash dedupe keeps a renamed or moved short from being uploaded a
+    second time, which the path-based check alone cannot catch."""
+    hash_path = video_path + '.hash'
+    try:
+        if os.path.getmtime(hash_path) >= os.path.getmtime(video_path):
+            with open(hash_path, 'r', encoding='utf-8') as f:
+                cached = f.read().strip()
+            if cached:
+                return cached
+    except OSError:
+        pass
+
+    with open(video_path, 'rb') as f:
+        try:
+            digest = hashlib.file_digest(f, 'blake2b').hexdigest()
+        except AttributeError:
+            # file_digest needs Python 3.11+; fall back to a buffered loop
+            hasher = hashlib.blake2b()
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+            digest = hasher.hexdigest()
 
-def log_uploaded_video(video_path, video_id, title):
-    """Appends the details of an uploaded video to the log file."""
+    try:
+        with open(hash_path, 'w', encoding='utf-8') as f:
+            f.write(digest)
+    except OSError as e:
+        logging.warning(f"Could not cache hash for {video_path}: {e}")
+    return digest
+
+# Upload records funnel through one background writer thread: callers only
+# enqueue, and the writer keeps the log handle open for the whole run instead
+# of paying an open/write/close per entry
+_log_queue = queue.Queue()
+_log_writer = None
+
+def _drain_log_queue():
+    """Writer-thread loop: appends queued records until it sees None."""
+    with open(UPLOADED_LOG_FILE, 'a', encoding='utf-8', buffering=1) as f:
+        for record in iter(_log_queue.get, None):
+            f.write(json.dumps(record) + '\n')
+
+def _ensure_log_writer():
+    global _log_writer
+    if _log_writer is None or not _log_writer.is_alive():
+        _log_writer = threading.Thread(target=_drain_log_queue, daemon=True)
+        _log_writer.start()
+
+def _shutdown_log_writer():
+    """Flushes the queue and stops the writer thread."""
+    global _log_writer
+    if _log_writer is not None and _log_writer.is_alive():
+        _log_queue.put(None)
+        _log_writer.join()
+    _log_writer = None
+
+def log_uploaded_video(video_path, video_id, title, file_hash=None):
+    """Queues an uploaded-video record for the JSONL log and keeps the pickle
+    sidecar in step with it."""
+    global _uploaded_index
     timestamp = datetime.datetime.now().isoformat()
     # It's good practice to normalize path for logging as well, to ensure consistency
     # with how it's read back. os.path.normpath will use native separators.
     normalized_video_path = os.path.normpath(video_path)
-    with open(UPLOADED_LOG_FILE, 'a', encoding='utf-8') as f:
-        f.write(f"{timestamp} | {normalized_video_path} | {video_id} | {title}\n")
+    _ensure_log_writer()
+    _log_queue.put({'ts': timestamp, 'path': normalized_video_path,
+                    'id': video_id, 'title': title, 'hash': file_hash})
+    if _uploaded_index is None:
+        _uploaded_index = {'paths': set(), 'hashes': set()}
+    _uploaded_index['paths'].add(normalized_video_path)
+    if file_hash:
+        _uploaded_index['hashes'].add(file_hash)
+    _save_uploaded_index(_uploaded_index)
     logging.info(f"Logged upload: {os.path.basename(video_path)}")
 
-# --- Main Logic ---
-def main():
-    try:
-        youtube = get_authenticated_service()
-    except Exception as e:
-        logging.critical(f"Failed to authenticate. Exiting: {e}")
-        return
-
-    uploaded_videos = get_uploaded_videos()
+def _read_description(path):
+    """Reads one rephrased description file; runs in the prefetch pool."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().strip()
+
+def _upload_one(credentials, job):
+    """Worker-thread entry point: uploads a single video on this thread's own
+    service object and reports the result back to main."""
+    video_file, relative_video_path, video_title, full_description, tags, video_size, video_hash = job
+    # A little jitter keeps workers from hitting the bucket in lockstep, then
+    # the token bucket paces actual upload starts under the quota budget
+    time.sleep(random.uniform(0, 2))
+    _upload_rate_limiter.acquire()
+    youtube = _service_for_thread(credentials)
+    video_id = upload_video(youtube, video_file, video_title, full_description, tags,
+                            file_size=video_size)
+    return relative_video_path, video_title, video_id, video_file, video_hash
+
+def discover_jobs():
+    """Scans the video and text trees and returns the list of pending upload
+    jobs, without touching the network or OAuth. Each job is
+    (video_path, relative_path, title, description, tags, size, hash)."""
+    # Normalize the logged paths to absolute form once, so the per-file
+    # dedupe below is one hash lookup regardless of how the path was logged
+    uploaded_index = get_uploaded_index()
+    uploaded_videos = {os.path.normpath(os.path.abspath(p)) for p in uploaded_index['paths']}
+    uploaded_hashes = uploaded_index['hashes']
     logging.info(f"Found {len(uploaded_videos)} already uploaded videos in log.")
 
-    # Iterate through categories (subdirectories in BASE_VIDEO_DIR)
-    for category_dir in os.listdir(BASE_VIDEO_DIR):
-        category_video_path = os.path.join(BASE_VIDEO_DIR, category_dir)
+    # Collect every pending upload first, then run them through a small
+    # thread pool: each upload mostly waits on the network, so a few
+    # concurrent resumable sessions use the idle bandwidth
+    pending_videos = []
+
+    # Iterate through categories (subdirectories in BASE_VIDEO_DIR).
+    # scandir reuses the type information from the directory listing, so the
+    # whole discovery phase runs without a stat per candidate file.
+    for cat_entry in os.scandir(BASE_VIDEO_DIR):
+        if not cat_entry.is_dir(follow_symlinks=False):
+            continue # Skip if it's not a directory
+        category_dir = cat_entry.name
         # --- IMPORTANT: Adjust category_text_path based on how it's relative to main_uploader.py ---
         # If BASE_TEXT_DIR is already relative to the script's execution directory
         # e.g., 'data/generated_text' in the project root
         category_text_path = os.path.join(BASE_TEXT_DIR, category_dir)
-        # If your 'data' folder is one level up from your script
-        # script_dir = os.path.dirname(__file__)
-        # category_text_path = os.path.join(script_dir, '..', BASE_TEXT_DIR, category_dir) # Example: if script in 'scripts/' and data in project root
-
-        if not os.path.isdir(category_video_path):
-            continue # Skip if it's not a directory
 
         logging.info(f"Processing category: {category_dir}")
 
+        # One scandir of the text folder makes the description check below an
+        # O(1) set membership instead of an os.path.exists stat per video
+        try:
+            description_files = {entry.name for entry in os.scandir(category_text_path)
+                                 if entry.is_file()}
+        except FileNotFoundError:
+            description_files = set()
+
         # Find all MP4 files in the current category
-        for video_file in glob.glob(os.path.join(category_video_path, '*.mp4')):
-            relative_video_path = os.path.relpath(video_file) # Store relative path for consistency in log
+        for vid_entry in os.scandir(cat_entry.path):
+            if not (vid_entry.is_file(follow_symlinks=False)
+                    and vid_entry.name.lower().endswith('.mp4')):
+                continue
+            video_file = vid_entry.path
 
-            if relative_video_path in uploaded_videos:
+            if os.path.normpath(os.path.abspath(video_file)) in uploaded_videos:
                 logging.info(f"Skipping already uploaded video: {os.path.basename(video_file)}")
                 continue
 
-            # Determine corresponding text file path
-            video_basename_with_ext = os.path.basename(video_file)
-            video_name_without_ext_full = os.path.splitext(video_basename_with_ext)[0] # e.g., "Mission to Batuu_short"
+            # DirEntry caches the stat, so the size check costs nothing extra;
+            # zero-byte files are failed encodes and oversize ones would be
+            # rejected by the API anyway
+            video_size = vid_entry.stat().st_size
+            if video_size == 0 or video_size > MAX_UPLOAD_SIZE:
+                logging.warning(f"Skipping {vid_entry.name}: size {video_size} bytes is not uploadable.")
+                continue
 
-            # Remove the "_short" suffix if present to get the base name for text file
-            if video_name_without_ext_full.endswith('_short'):
-                video_name_for_text_file = video_name_without_ext_full.removesuffix('_short')
-            else:
-                video_name_for_text_file = video_name_without_ext_full
+            # Content hash catches renamed/moved files the path check missed
+            video_hash = _video_content_hash(video_file)
+            if video_hash in uploaded_hashes:
+                logging.info(f"Skipping already uploaded content (hash match): {vid_entry.name}")
+                continue
 
-            # *** --- NEW CHANGE: Append "_rephrased.txt" for text file path --- ***
-            text_file_path_for_video = os.path.join(category_text_path, f"{video_name_for_text_file}_rephrased.txt")
+            relative_video_path = os.path.relpath(video_file) # Store relative path for consistency in log
 
-            if not os.path.exists(text_file_path_for_video): # Use the newly constructed path here
-                logging.warning(f"No description file found for {os.path.basename(video_file)} ({text_file_path_for_video}). Skipping.")
-                continue
+            # Determine corresponding text file path: strip the "_short"
+            # suffix if present to get the base name for the text file
+            # (e.g. "Mission to Batuu_short" -> "Mission to Batuu")
+            video_name_for_text_file = _SHORT_SUFFIX_RE.sub('', os.path.splitext(vid_entry.name)[0])
 
-            # Read description
-            with open(text_file_path_for_video, 'r', encoding='utf-8') as f: # Use the newly constructed path here
-                description_content = f.read().strip()
+            # *** --- NEW CHANGE: Append "_rephrased.txt" for text file path --- ***
+            text_file_name = f"{video_name_for_text_file}_rephrased.txt"
+            text_file_path_for_video = os.path.join(category_text_path, text_file_name)
 
-            # Construct full description with hashtags
-            full_description = f"{description_content}\n\n" + " ".join(GLOBAL_HASHTAGS)
+            if text_file_name not in description_files:
+                logging.warning(f"No description file found for {vid_entry.name} ({text_file_path_for_video}). Skipping.")
+                continue
 
             # Use the clean name for the video title (still without _short or _rephrased)
-            video_title = video_name_for_text_file.replace('_', ' ').title() # Basic title formatting
+            video_title = _format_title(video_name_for_text_file)
 
             # Prepare tags (example: based on categories and global hashtags)
-            tags = [category_dir.replace('_', ' ').lower()] + [h.strip('#') for h in GLOBAL_HASHTAGS]
-            tags = list(set(tags)) # Remove duplicates
+            # dict.fromkeys dedupes in one pass and keeps the original order
+            tags = list(dict.fromkeys([category_dir.replace('_', ' ').lower(), *GLOBAL_TAG_NAMES]))
+
+            pending_videos.append((video_file, relative_video_path, video_title, tags, text_file_path_for_video, video_size, video_hash))
+
+    if not pending_videos:
+        return []
+
+    # Read all the description files up front; past a couple dozen pending
+    # videos the small blocking reads overlap their disk latency in a thread
+    # pool instead of running back to back
+    description_paths = [job[4] for job in pending_videos]
+    if len(description_paths) > DESCRIPTION_PREFETCH_MIN:
+        with ThreadPoolExecutor(max_workers=16) as reader_pool:
+            descriptions = dict(zip(description_paths,
+                                    reader_pool.map(_read_description, description_paths)))
+    else:
+        descriptions = {path: _read_description(path) for path in description_paths}
 
-            logging.info(f"Attempting to upload: {video_title}")
-            logging.info(f"Description: {full_description[:100]}...") # Show first 100 chars
-            logging.info(f"Tags: {', '.join(tags)}")
+    upload_jobs = []
+    for video_file, relative_video_path, video_title, tags, text_file_path_for_video, video_size, video_hash in pending_videos:
+        # Construct full description with hashtags
+        full_description = descriptions[text_file_path_for_video] + HASHTAG_SUFFIX
 
-            # Perform the upload
-            video_id = upload_video(youtube, video_file, video_title, full_description, tags)
+        logging.info(f"Queueing upload: {video_title}")
+        # The preview slice and tag join are debug detail; skip the string
+        # work entirely unless that level is actually enabled
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Description: {full_description[:100]}...") # Show first 100 chars
+            logging.debug(f"Tags: {', '.join(tags)}")
 
-            if video_id:
-                log_uploaded_video(relative_video_path, video_id, video_title)
-            else:
-                logging.error(f"Failed to upload or log: {os.path.basename(video_file)}")
+        upload_jobs.append((video_file, relative_video_path, video_title, full_description, tags, video_size, video_hash))
+
+    return upload_jobs
+
+# --- Main Logic ---
+def main():
+    # Discover work before authenticating: an empty run should not cost an
+    # OAuth prompt or a token refresh
+    upload_jobs = discover_jobs()
+    if not upload_jobs:
+        logging.info("No new videos to upload.")
+        return
+
+    try:
+        credentials = get_credentials()
+    except Exception as e:
+        logging.critical(f"Failed to authenticate. Exiting: {e}")
+        return
+
+    # The uploaded-shorts log is only appended here on the main thread as the
+    # futures complete, so the workers never contend for it
+    try:
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            futures = [pool.submit(_upload_one, credentials, job) for job in upload_jobs]
+            for future in as_completed(futures):
+                relative_video_path, video_title, video_id, video_file, video_hash = future.result()
+                if video_id:
+                    log_uploaded_video(relative_video_path, video_id, video_title, video_hash)
+                else:
+                    logging.error(f"Failed to upload or log: {os.path.basename(video_file)}")
+    finally:
+        # Make sure every queued record reaches the log before returning
+        _shutdown_log_writer()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file